@@ -0,0 +1,234 @@
+"""Cohort analytics: columnar export of commit metadata and vectorized stats
+
+``export_cohort`` runs ``git log`` and ``git for-each-ref`` on each
+repository in a process pool and flattens the output into NumPy columns
+(one row per commit, per branch and per repository), written with
+``numpy.savez_compressed``. ``cohort_stats`` computes distributions over
+those columns without any per-repository Python loop.
+
+NumPy is an optional dependency: ``pip install lifegit[analytics]``.
+"""
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .grading import find_repos
+
+if TYPE_CHECKING:
+    import numpy as np
+
+FORMAT_VERSION = 2
+MAIN_BRANCHES = ("main", "master")
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+class AnalyticsUnavailable(RuntimeError):
+    """Raised when the optional analytics dependencies are missing"""
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise AnalyticsUnavailable(
+            "Cohort analytics need NumPy: pip install 'lifegit[analytics]'"
+        ) from None
+    return numpy
+
+
+@dataclass(frozen=True, slots=True)
+class RepoFacts:
+    """Raw metadata for one repository, as returned by a pool worker"""
+
+    path: str
+    commit_times: tuple[int, ...] = ()
+    commit_parents: tuple[int, ...] = ()
+    branch_names: tuple[str, ...] = ()
+    branch_times: tuple[int, ...] = ()
+    first_decision_commit: int = 0  # 0 when the Act 1 file was never committed
+    first_whatif_commit: int = 0  # 0 when no what-if branch has its own commits
+    error: str | None = None
+
+
+def extract_repo(location: str) -> RepoFacts:
+    """Read commit and branch metadata from one repository or bundle"""
+    from .content import store
+    from .git_wrapper import LifeRepo
+
+    content = store.current()
+    decision_file = content.act1.prompts.file_name
+    whatif_prefix = content.act2.prompts.branch_prefix
+    path = Path(location)
+    try:
+        repo = LifeRepo.open(path)
+        with repo:
+            if not repo.is_git_repo() or not repo.is_initialized():
+                return RepoFacts(location)
+            git = repo.repo.git
+
+            times, parents = [], []
+            for line in git.log("--branches", "--format=%ct %P").splitlines():
+                timestamp, *parent_shas = line.split()
+                times.append(int(timestamp))
+                parents.append(len(parent_shas))
+
+            names, tips = [], []
+            refs = git.for_each_ref(
+                "--format=%(refname:short) %(committerdate:unix)", "refs/heads"
+            )
+            for line in refs.splitlines():
+                name, _, timestamp = line.rpartition(" ")
+                names.append(name)
+                tips.append(int(timestamp))
+
+            # Act 1 is done once the decision file is first committed
+            added = git.log(
+                "--branches", "--diff-filter=A", "--format=%ct", "--", decision_file
+            ).split()
+            first_decision = min(map(int, added), default=0)
+
+            # Act 2 is done once a what-if branch carries a commit main doesn't
+            first_whatif = 0
+            main = next((b for b in MAIN_BRANCHES if b in names), None)
+            if main is not None and any(n.startswith(whatif_prefix) for n in names):
+                own = git.log(
+                    f"--branches={whatif_prefix}*", "--not", main, "--format=%ct"
+                ).split()
+                first_whatif = min(map(int, own), default=0)
+
+            return RepoFacts(
+                path=location,
+                commit_times=tuple(times),
+                commit_parents=tuple(parents),
+                branch_names=tuple(names),
+                branch_times=tuple(tips),
+                first_decision_commit=first_decision,
+                first_whatif_commit=first_whatif,
+            )
+    except Exception as exc:  # one broken repo must not stop the export
+        return RepoFacts(location, error=f"{type(exc).__name__}: {exc}")
+
+
+def _columns(facts: list[RepoFacts]) -> dict[str, "np.ndarray"]:
+    """Flatten per-repository facts into columns keyed by table and field"""
+    np = _numpy()
+
+    commit_counts = np.array([len(f.commit_times) for f in facts], dtype=np.int64)
+    branch_counts = np.array([len(f.branch_names) for f in facts], dtype=np.int64)
+    repo_index = np.arange(len(facts), dtype=np.int32)
+
+    def flat(field: str, dtype) -> "np.ndarray":
+        values = itertools.chain.from_iterable(getattr(f, field) for f in facts)
+        return np.fromiter(values, dtype=dtype)
+
+    return {
+        "format_version": np.array(FORMAT_VERSION),
+        "repo.path": np.array([f.path for f in facts], dtype=str),
+        "repo.error": np.array([bool(f.error) for f in facts]),
+        "repo.act1_completed": np.array(
+            [f.first_decision_commit for f in facts], dtype=np.int64
+        ),
+        "repo.act2_completed": np.array(
+            [f.first_whatif_commit for f in facts], dtype=np.int64
+        ),
+        "commit.repo": np.repeat(repo_index, commit_counts),
+        "commit.time": flat("commit_times", np.int64),
+        "commit.parents": flat("commit_parents", np.int8),
+        "branch.repo": np.repeat(repo_index, branch_counts),
+        "branch.name": np.array([n for f in facts for n in f.branch_names], dtype=str),
+        "branch.time": flat("branch_times", np.int64),
+    }
+
+
+def export_cohort(
+    cohort: Path, output: Path, processes: int | None = None
+) -> tuple[int, int]:
+    """Extract every repository in a cohort into one compressed column file
+
+    Returns (repositories exported, repositories that failed).
+    """
+    np = _numpy()
+    locations = [str(path.resolve()) for path in find_repos(cohort)]
+    processes = processes or os.cpu_count() or 1
+
+    if processes > 1 and len(locations) > 1:
+        with ProcessPoolExecutor(processes) as pool:
+            chunksize = max(1, len(locations) // (processes * 8))
+            facts = list(pool.map(extract_repo, locations, chunksize=chunksize))
+    else:
+        facts = [extract_repo(location) for location in locations]
+
+    np.savez_compressed(output, **_columns(facts))
+    failed = sum(1 for f in facts if f.error)
+    return len(facts) - failed, failed
+
+
+def load_columns(path: Path) -> dict[str, "np.ndarray"]:
+    """Read a column file written by export_cohort"""
+    np = _numpy()
+    with np.load(path) as data:
+        columns = {name: data[name] for name in data.files}
+    if int(columns.get("format_version", -1)) != FORMAT_VERSION:
+        raise ValueError(f"{path} is not a lifegit cohort export (version mismatch)")
+    return columns
+
+
+def _distribution(values: "np.ndarray") -> dict[str, float]:
+    np = _numpy()
+    if not values.size:
+        return {"count": 0}
+    summary = {"count": int(values.size), "mean": float(values.mean())}
+    for p, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        summary[f"p{p}"] = float(value)
+    return summary
+
+
+def cohort_stats(columns: dict[str, "np.ndarray"]) -> dict[str, dict[str, float]]:
+    """Distributions over a cohort export, computed on whole columns"""
+    from .content import store
+
+    np = _numpy()
+    whatif_prefix = store.current().act2.prompts.branch_prefix
+    repos = columns["repo.path"].size
+    # Unreadable repositories have no commits or branches, not zero of each
+    readable = ~columns["repo.error"]
+    commit_repo = columns["commit.repo"]
+    commit_time = columns["commit.time"]
+    branch_repo = columns["branch.repo"]
+
+    def per_student(owners: "np.ndarray") -> "np.ndarray":
+        return np.bincount(owners, minlength=repos)[readable]
+
+    # Sort by (repo, time) once; gaps are diffs that stay within a repo
+    order = np.lexsort((commit_time, commit_repo))
+    times, owners = commit_time[order], commit_repo[order]
+    same_repo = owners[1:] == owners[:-1]
+    gaps = np.diff(times)[same_repo]
+
+    whatif = np.char.startswith(columns["branch.name"].astype(str), whatif_prefix)
+    act1 = columns["repo.act1_completed"]
+    act2 = columns["repo.act2_completed"]
+    both = (act1 > 0) & (act2 > 0)
+
+    return {
+        "commits per student": _distribution(per_student(commit_repo)),
+        "minutes between commits": _distribution(gaps / 60),
+        "branches per student": _distribution(per_student(branch_repo)),
+        "what-if branches per student": _distribution(
+            per_student(branch_repo[whatif])
+        ),
+        "merges per student": _distribution(
+            per_student(commit_repo[columns["commit.parents"] > 1])
+        ),
+        "minutes from act 1 to act 2": _distribution((act2[both] - act1[both]) / 60),
+        "completion": {
+            "repositories": repos,
+            "act 1": int((act1 > 0).sum()),
+            "act 2": int((act2 > 0).sum()),
+            "errors": int(columns["repo.error"].sum()),
+        },
+    }
@@ -0,0 +1,291 @@
+"""asyncio counterpart of LifeRepo
+
+AsyncLifeRepo offers the same operations as LifeRepo, but each git call is
+an asyncio subprocess and index and working-tree reads run in a worker
+thread, so one event loop can serve several students, or run a watcher
+next to the prompt loop, without stalling.
+
+Every instance allows at most ``max_concurrency`` git processes at once.
+Cancelling an awaiting task kills its git process instead of leaving it
+running.
+"""
+
+import asyncio
+import os
+from pathlib import Path
+
+from git.exc import GitCommandError
+
+from . import index_reader, reflog
+from .git_wrapper import RepoLockedError
+from .gitparse import (
+    LOCK_FILES,
+    LOCK_RETRY_DELAYS,
+    WorkingTreeStatus,
+    is_lock_error,
+    parse_status,
+)
+from .index_reader import ConflictEntry
+
+DEFAULT_MAX_CONCURRENCY = 4
+
+
+class AsyncLifeRepo:
+    """Non-blocking interface to one repository for tutorial operations"""
+
+    def __init__(
+        self, path: Path = Path.cwd(), max_concurrency: int = DEFAULT_MAX_CONCURRENCY
+    ):
+        self.path = Path(path)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._git_dir: Path | None = None
+        self._bare: bool | None = None
+        self._hash_size: int | None = None
+
+    async def _run(self, *args: str, allowed: tuple[int, ...] = (0,)) -> tuple[int, str]:
+        """Run git in the repository; return (exit status, stdout)
+
+        Raises GitCommandError for a status outside allowed.
+        """
+        # Like LifeRepo, never fall back to a repository in a parent directory
+        env = {**os.environ, "GIT_CEILING_DIRECTORIES": str(self.path.resolve().parent)}
+        async with self._semaphore:
+            process = await asyncio.create_subprocess_exec(
+                "git",
+                "-C",
+                str(self.path),
+                *args,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=env,
+            )
+            try:
+                stdout, stderr = await process.communicate()
+            except asyncio.CancelledError:
+                process.kill()
+                await process.wait()
+                raise
+
+        if process.returncode not in allowed:
+            raise GitCommandError(
+                ["git", *args], process.returncode, stderr.decode(errors="replace")
+            )
+        return process.returncode, stdout.decode(errors="surrogateescape")
+
+    async def _git(self, *args: str) -> str:
+        _, output = await self._run(*args)
+        return output.rstrip("\n")
+
+    async def _write(self, *args: str) -> str:
+        """Run a write command, backing off while another git process holds a lock"""
+        last_error: Exception | None = None
+        for delay in (0, *LOCK_RETRY_DELAYS):
+            await asyncio.sleep(delay)
+            if await self.is_locked():
+                continue
+            try:
+                return await self._git(*args)
+            except GitCommandError as exc:
+                if not is_lock_error(exc):
+                    raise
+                last_error = exc
+
+        raise RepoLockedError(
+            f"Repository at {self.path} stayed locked by another git process"
+        ) from last_error
+
+    # Repository layout
+
+    async def git_dir(self) -> Path:
+        """Absolute path of the .git directory (the repository itself if bare)"""
+        if self._git_dir is None:
+            self._git_dir = Path(await self._git("rev-parse", "--absolute-git-dir"))
+        return self._git_dir
+
+    async def is_git_repo(self) -> bool:
+        """Check if this path is a git repository"""
+        try:
+            await self.git_dir()
+        except GitCommandError:
+            return False
+        return True
+
+    async def init(self) -> "AsyncLifeRepo":
+        """Initialize a new git repository"""
+        await asyncio.to_thread(self.path.mkdir, parents=True, exist_ok=True)
+        await self._git("init", "--quiet")
+        self._git_dir = self._bare = None
+        return self
+
+    async def is_bare(self) -> bool:
+        """Check if there is no working tree (bare repository or bundle)"""
+        if self._bare is None:
+            self._bare = await self._git("rev-parse", "--is-bare-repository") == "true"
+        return self._bare
+
+    async def is_locked(self) -> bool:
+        """Check if another git process currently holds the index or HEAD lock"""
+        git_dir = await self.git_dir()
+        return await asyncio.to_thread(
+            lambda: any((git_dir / name).exists() for name in LOCK_FILES)
+        )
+
+    # Core operations
+
+    async def commit(self, message: str, files: list[str] | None = None) -> str:
+        """Commit with optional file staging; return the new commit's SHA"""
+        if files:
+            await self.stage_files(files)
+        # Like LifeRepo.commit: no hooks, and the index is committed as it is
+        await self._write(
+            "commit", "--quiet", "--no-verify", "--allow-empty", "-m", message
+        )
+        return await self._git("rev-parse", "HEAD")
+
+    async def create_branch(self, name: str):
+        """Create a new branch"""
+        await self._write("branch", name)
+
+    async def checkout(self, branch: str):
+        """Switch to a branch"""
+        await self._write("checkout", "--quiet", branch)
+
+    async def merge(self, branch: str) -> str:
+        """Merge another branch into current"""
+        return await self._write("merge", "--no-edit", branch)
+
+    async def stage_files(self, files: list[str]):
+        """Stage files for commit"""
+        await self._write("add", "--", *files)
+
+    # Validation helpers
+
+    async def is_initialized(self) -> bool:
+        """Check if repo has at least one commit"""
+        return bool(await self._git("for-each-ref", "--count=1", "refs/heads"))
+
+    async def count_commits(
+        self, branch: str | None = None, limit: int | None = None
+    ) -> int:
+        """Count commits on a branch, stopping the walk at limit if given"""
+        if not await self.is_initialized():
+            return 0
+        args = ["--count"] if limit is None else ["--count", f"--max-count={limit}"]
+        return int(await self._git("rev-list", *args, branch or "HEAD"))
+
+    async def get_last_commit_message(self) -> str:
+        """Get the most recent commit message"""
+        if not await self.is_initialized():
+            return ""
+        return (await self._git("log", "-1", "--format=%B")).strip()
+
+    async def status(self) -> WorkingTreeStatus:
+        """Staged, unstaged, untracked and conflicted paths from one ``git status``"""
+        if await self.is_bare():
+            return WorkingTreeStatus()
+        _, output = await self._run(
+            "status", "--porcelain=v2", "-z", "--untracked-files=normal"
+        )
+        return parse_status(output)
+
+    async def untracked_files(self) -> list[str]:
+        """List of untracked files (a new directory counts once, as "dir/")"""
+        return list((await self.status()).untracked)
+
+    async def staged_files(self) -> list[str]:
+        """List of staged files"""
+        return list((await self.status()).staged)
+
+    async def has_uncommitted_changes(self) -> bool:
+        """Check for uncommitted changes (staged or unstaged)"""
+        return (await self.status()).is_dirty
+
+    async def has_untracked_files(self) -> bool:
+        """Check for untracked files"""
+        return bool((await self.status()).untracked)
+
+    async def current_branch(self) -> str:
+        """Get name of current branch"""
+        status, output = await self._run(
+            "symbolic-ref", "--short", "-q", "HEAD", allowed=(0, 1)
+        )
+        return output.strip() if status == 0 else "(detached HEAD)"
+
+    async def list_branches(self, prefix: str = "", limit: int | None = None) -> list[str]:
+        """Get branch names, optionally only those starting with prefix"""
+        args = ["--format=%(refname:lstrip=2)"]
+        if limit is not None:
+            args.append(f"--count={limit}")
+        pattern = f"refs/heads/{prefix}*" if prefix else "refs/heads"
+        return (await self._git("for-each-ref", *args, pattern)).splitlines()
+
+    async def has_branch(self, name: str) -> bool:
+        """Check for one branch without listing the others"""
+        status, _ = await self._run(
+            "show-ref", "--verify", "--quiet", f"refs/heads/{name}", allowed=(0, 1)
+        )
+        return status == 0
+
+    async def is_ancestor(self, ancestor: str, descendant: str) -> bool:
+        """Check if ancestor is reachable from descendant"""
+        status, _ = await self._run(
+            "merge-base", "--is-ancestor", ancestor, descendant, allowed=(0, 1)
+        )
+        return status == 0
+
+    async def _index_args(self) -> tuple[Path, int]:
+        if self._hash_size is None:
+            object_format = await self._git("rev-parse", "--show-object-format")
+            self._hash_size = 32 if object_format == "sha256" else 20
+        return await self.git_dir() / "index", self._hash_size
+
+    async def has_conflicts(self) -> bool:
+        """Check if there are merge conflicts"""
+        index_path, hash_size = await self._index_args()
+        return await asyncio.to_thread(index_reader.has_unmerged, index_path, hash_size)
+
+    async def conflicts(self) -> list[ConflictEntry]:
+        """Unmerged paths with their stages and whether markers remain"""
+        index_path, hash_size = await self._index_args()
+        return await asyncio.to_thread(
+            index_reader.conflict_inventory, index_path, self.path, hash_size
+        )
+
+    async def get_reflog(self, n: int = 10) -> list[str]:
+        """Get recent reflog entries"""
+        log_path = await self.git_dir() / "logs" / "HEAD"
+
+        def read() -> list[str]:
+            entries = zip(range(n), reflog.iter_reflog(log_path))
+            return [f"{e.new_sha[:7]} HEAD@{{{i}}}: {e.message}" for i, e in entries]
+
+        return await asyncio.to_thread(read)
+
+    async def _tree_entry(self, revision: str, filename: str) -> str | None:
+        """Object name of filename in a commit's tree, or None if absent"""
+        status, output = await self._run(
+            "rev-parse",
+            "--verify",
+            "--quiet",
+            f"{revision}:{filename}",
+            allowed=(0, 1, 128),
+        )
+        return output.strip() if status == 0 else None
+
+    async def file_exists(self, filename: str) -> bool:
+        """Check if a file exists in the working tree (tip tree when bare)"""
+        if not await self.is_bare():
+            return await asyncio.to_thread((self.path / filename).exists)
+        if not await self.is_initialized():
+            return False
+        return await self._tree_entry("HEAD", filename) is not None
+
+    async def file_in_last_commit(self, filename: str) -> bool:
+        """Check if a file was modified in the last commit (no blob is read)"""
+        if not await self.is_initialized():
+            return False
+        current, previous = await asyncio.gather(
+            self._tree_entry("HEAD", filename), self._tree_entry("HEAD^", filename)
+        )
+        return current != previous
@@ -0,0 +1,94 @@
+"""Resource budgets for validating untrusted repositories
+
+A submission may carry a gigantic history, huge blobs or thousands of
+branches. While a budget is active on a LifeRepo, every walk it performs
+is charged against a limit on wall time, memory growth and objects
+(commits or refs) visited, and crossing any limit raises BudgetExceeded
+instead of letting the grader run out of memory.
+
+Objects are counted by the walks that can grow with a submission
+(``count_commits`` and ``list_branches``); every other git call is held
+to the time and memory limits. An answer reused from LifeRepo's fact
+cache walks nothing, so it is checked against time and memory but not
+charged objects.
+
+Memory growth is measured from the current resident set size, which is
+only read from /proc. Elsewhere (macOS, Windows) the memory limit is not
+enforced: the portable fallback, ``ru_maxrss``, is a peak rather than
+the current size and would misreport growth.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+
+DEFAULT_SECONDS = 30.0
+DEFAULT_MEMORY_MB = 512
+DEFAULT_OBJECTS = 1_000_000
+
+# failing_check reported for a validation stopped by its budget
+BUDGET_EXCEEDED = "budget-exceeded"
+
+
+@dataclass(frozen=True, slots=True)
+class Budget:
+    """Limits for one validation; None disables a limit"""
+
+    seconds: float | None = DEFAULT_SECONDS
+    memory_mb: int | None = DEFAULT_MEMORY_MB
+    objects: int | None = DEFAULT_OBJECTS
+
+
+class BudgetExceeded(RuntimeError):
+    """Raised when a validation uses more than its budget allows"""
+
+    def __init__(self, resource: str, limit: float):
+        super().__init__(f"budget exceeded: {resource} over {limit}")
+        self.resource = resource
+        self.limit = limit
+
+
+def _rss_bytes() -> int | None:
+    """Current resident set size, or None where it can't be read"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+class BudgetMeter:
+    """Running totals for one active budget"""
+
+    def __init__(self, budget: Budget):
+        self.budget = budget
+        self.objects = 0
+        self._started = time.monotonic()
+        self._baseline_rss = _rss_bytes()
+
+    def remaining_seconds(self) -> float | None:
+        if self.budget.seconds is None:
+            return None
+        return self.budget.seconds - (time.monotonic() - self._started)
+
+    def remaining_objects(self) -> int | None:
+        if self.budget.objects is None:
+            return None
+        return self.budget.objects - self.objects
+
+    def check(self):
+        """Raise if time or memory has run out"""
+        remaining = self.remaining_seconds()
+        if remaining is not None and remaining <= 0:
+            raise BudgetExceeded("seconds", self.budget.seconds)
+        if self.budget.memory_mb is not None and self._baseline_rss is not None:
+            grown = (_rss_bytes() or 0) - self._baseline_rss
+            if grown > self.budget.memory_mb * 1024 * 1024:
+                raise BudgetExceeded("memory MB", self.budget.memory_mb)
+
+    def charge(self, objects: int):
+        """Account for objects walked, then check the other limits"""
+        self.objects += objects
+        if self.budget.objects is not None and self.objects > self.budget.objects:
+            raise BudgetExceeded("objects walked", self.budget.objects)
+        self.check()
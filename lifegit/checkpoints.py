@@ -0,0 +1,287 @@
+"""Checkpoints: snapshots of a student's repo that can be restored instantly
+
+A checkpoint is a commit shaped like the ones ``git stash`` makes:
+
+- its tree is the working tree, untracked files included, written
+  through a temporary index so the student's own index is not touched
+- its first parent is a commit of the index as it was
+- its other parents are the branch tips, which keeps them from being
+  garbage collected
+- its message records HEAD and every branch
+
+Checkpoints are kept out of the student's own repository, which the
+tutorial teaches them to read: they live in a bare repository at
+``.git/lifegit/checkpoints`` that borrows the student's objects through
+``objects/info/alternates``. Only objects the student's repository
+doesn't already have (checkpoint commits, trees, untracked files) are
+written there, and no ref of the student's repository points at them, so
+they never show up in ``git log --all``, gitk or an IDE's graph. The
+checkpoints are chained in the reflog of CHECKPOINT_REF in that
+repository, so nothing is copied. A checkpoint whose branch tips the
+student has since deleted and garbage collected can no longer be
+restored. The temporary index is kept from one checkpoint to
+the next, and its stat data means only files changed since the last one
+are hashed. Untracked files over MAX_UNTRACKED_BYTES are left out. A
+restore moves the working tree with a two-tree ``read-tree -m -u``,
+which only rewrites paths that differ.
+Merge-in-progress state is not recorded; restoring clears it.
+"""
+
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from git.exc import GitCommandError
+
+from . import reflog
+
+if TYPE_CHECKING:
+    from .git_wrapper import LifeRepo
+
+STORE_DIR = Path("lifegit") / "checkpoints"
+CHECKPOINT_REF = "refs/checkpoints"
+CHECKPOINT_INDEX = "lifegit-checkpoint-index"
+# Larger untracked files (datasets, videos) are not copied into checkpoints
+MAX_UNTRACKED_BYTES = 10 * 1024 * 1024
+
+# Checkpoints are made whether or not the student has set up an identity
+_IDENTITY = {
+    "GIT_AUTHOR_NAME": "Life.git",
+    "GIT_AUTHOR_EMAIL": "lifegit@localhost",
+    "GIT_COMMITTER_NAME": "Life.git",
+    "GIT_COMMITTER_EMAIL": "lifegit@localhost",
+}
+_MERGE_STATE_FILES = ("MERGE_HEAD", "MERGE_MSG", "MERGE_MODE", "AUTO_MERGE")
+
+
+class CheckpointError(RuntimeError):
+    """Raised when a checkpoint can't be taken or found"""
+
+
+@dataclass(frozen=True, slots=True)
+class Checkpoint:
+    """One recorded repo state"""
+
+    sha: str
+    label: str
+    timestamp: int
+
+
+def _message(label: str, head: str, refs: dict[str, str]) -> str:
+    lines = [label, "", f"HEAD {head}"]
+    lines.extend(f"{sha} {name}" for name, sha in sorted(refs.items()))
+    return "\n".join(lines) + "\n"
+
+
+def _parse_message(message: str) -> tuple[str, dict[str, str]]:
+    """Return (HEAD, {refname: sha}) from a checkpoint message"""
+    head, refs = "", {}
+    for line in message.splitlines()[2:]:
+        if line.startswith("HEAD "):
+            head = line[5:]
+        elif line:
+            sha, name = line.split(" ", 1)
+            refs[name] = sha
+    return head, refs
+
+
+def _branch_refs(repo: "LifeRepo") -> dict[str, str]:
+    listing = repo.repo.git.for_each_ref("--format=%(refname) %(objectname)", "refs/heads")
+    return dict(line.split(" ") for line in listing.splitlines())
+
+
+def _head(repo: "LifeRepo") -> str:
+    """HEAD as ``ref: <refname>``, or a SHA when detached"""
+    try:
+        return "ref: " + repo.repo.git.symbolic_ref("-q", "HEAD")
+    except GitCommandError:
+        return repo.repo.git.rev_parse("HEAD")
+
+
+def _large_untracked(repo: "LifeRepo", env: dict[str, str]) -> list[str]:
+    """Files over MAX_UNTRACKED_BYTES that the student hasn't staged
+
+    Only files new or changed since the index in env last saw them are
+    looked at, so unchanged ones cost nothing.
+    """
+    git = repo.repo.git
+    root = Path(repo.repo.working_tree_dir)
+    large = []
+    for path in git.ls_files("-o", "-m", "--exclude-standard", "-z", env=env).split("\0"):
+        try:
+            if path and (root / path).lstat().st_size > MAX_UNTRACKED_BYTES:
+                large.append(path)
+        except OSError:
+            continue  # deleted
+    if large:
+        tracked = set(git.ls_files("-z").split("\0"))
+        large = [path for path in large if path not in tracked]
+    return large
+
+
+def _store(repo: "LifeRepo") -> Path:
+    """The bare repository holding checkpoints, created on first use"""
+    common_dir = Path(repo.repo.common_dir)
+    store = common_dir / STORE_DIR
+    if not (store / "HEAD").exists():
+        repo.repo.git.init("--bare", "--quiet", str(store))
+        # Relative, so the repository can still be moved or renamed
+        alternates = store / "objects" / "info" / "alternates"
+        alternates.write_text(os.path.relpath(common_dir / "objects", store / "objects") + "\n")
+    return store
+
+
+def _objects(store: Path) -> dict[str, str]:
+    """Environment writing new objects to the store, reading both"""
+    return {"GIT_OBJECT_DIRECTORY": str(store / "objects")}
+
+
+def _worktree_tree(repo: "LifeRepo", index_file: Path, store: Path) -> str:
+    """Write the working tree as a tree, through a separate index
+
+    ``add -A`` trusts the index's stat data, so it only hashes files that
+    changed since that index last saw them.
+    """
+    git = repo.repo.git
+    env = {"GIT_INDEX_FILE": str(index_file), **_objects(store)}
+    large = _large_untracked(repo, env)
+    if large:
+        git.update_index("--force-remove", "--", *large, env=env)
+    git.add("-A", "--", ".", *(f":(exclude,literal){path}" for path in large), env=env)
+    return git.write_tree(env=env)
+
+
+def _copy_index(repo: "LifeRepo", target: Path):
+    index = Path(repo.repo.git_dir) / "index"
+    if index.exists():
+        shutil.copyfile(index, target)
+
+
+def take(repo: "LifeRepo", label: str) -> Checkpoint:
+    """Record the repo's current state under label"""
+    git = repo.repo.git
+    git_dir = Path(repo.repo.git_dir)
+    store = _store(repo)
+    objects = _objects(store)
+
+    try:
+        index_tree = git.write_tree(env=objects)
+    except GitCommandError as exc:
+        raise CheckpointError("The index has unresolved conflicts") from exc
+
+    # Carried over from the last checkpoint, whose tree keeps every blob it
+    # names from being pruned; seeded from the student's index without one
+    scratch = git_dir / CHECKPOINT_INDEX
+    if not scratch.exists() or not _log_path(repo).exists():
+        _copy_index(repo, scratch)
+    worktree_tree = _worktree_tree(repo, scratch, store)
+
+    refs = _branch_refs(repo)
+    index_commit = git.commit_tree(index_tree, "-m", "index", env={**objects, **_IDENTITY})
+
+    message_file = git_dir / "LIFEGIT_CHECKPOINT_MSG"
+    message_file.write_text(_message(label, _head(repo), refs))
+    try:
+        parents = [index_commit, *dict.fromkeys(refs.values())]
+        sha = git.commit_tree(
+            worktree_tree,
+            *(arg for parent in parents for arg in ("-p", parent)),
+            "-F",
+            str(message_file),
+            env={**objects, **_IDENTITY},
+        )
+    finally:
+        message_file.unlink(missing_ok=True)
+
+    git.update_ref(
+        "--create-reflog",
+        "-m",
+        label,
+        CHECKPOINT_REF,
+        sha,
+        env={"GIT_DIR": str(store), **_IDENTITY},
+    )
+    timestamp = int(git.show("-s", "--format=%ct", sha, env=objects))
+    return Checkpoint(sha, label, timestamp)
+
+
+def _log_path(repo: "LifeRepo") -> Path:
+    return Path(repo.repo.common_dir) / STORE_DIR / "logs" / CHECKPOINT_REF
+
+
+def history(repo: "LifeRepo") -> list[Checkpoint]:
+    """All checkpoints, newest first"""
+    return [
+        Checkpoint(sha=entry.new_sha, label=entry.message, timestamp=entry.timestamp)
+        for entry in reflog.iter_reflog(_log_path(repo))
+    ]
+
+
+def find(repo: "LifeRepo", selector: str) -> Checkpoint:
+    """Look up a checkpoint by position (0 is the newest) or SHA prefix"""
+    checkpoints = history(repo)
+    if selector.isdigit() and int(selector) < len(checkpoints):
+        return checkpoints[int(selector)]
+    matches = [c for c in checkpoints if c.sha.startswith(selector)]
+    if not matches:
+        raise CheckpointError(f"No checkpoint matches '{selector}'")
+    return matches[0]
+
+
+def restore(repo: "LifeRepo", checkpoint: Checkpoint):
+    """Put refs, HEAD, index and working tree back as they were at checkpoint
+
+    Callers take a checkpoint first so the restore can be undone. Holds
+    index.lock throughout, so git commands run meanwhile fail rather
+    than interleave.
+    """
+    git = repo.repo.git
+    git_dir = Path(repo.repo.git_dir)
+    store = _store(repo)
+    objects = _objects(store)
+    sha = checkpoint.sha
+    head, refs = _parse_message(git.show("-s", "--format=%B", sha, env=objects))
+    target_worktree, target_index = git.rev_parse(
+        f"{sha}^{{tree}}", f"{sha}^1^{{tree}}", env=objects
+    ).split()
+
+    lock = git_dir / "index.lock"
+    scratch = git_dir / "lifegit-restore-index"
+    # Fails with FileExistsError while another git process holds the index
+    os.close(os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+    try:
+        # The checkpoint index has fresh stat data for the current working tree
+        carried = git_dir / CHECKPOINT_INDEX
+        if carried.exists():
+            shutil.copyfile(carried, scratch)
+        else:
+            _copy_index(repo, scratch)
+        # Restored files are read from the store; the student's repository
+        # rewrites any tree it lacks on its next commit
+        env = {"GIT_INDEX_FILE": str(scratch), **objects}
+        current_worktree = _worktree_tree(repo, scratch, store)
+        # Two-tree merge: only paths that differ are written or removed
+        git.read_tree("-m", "-u", current_worktree, target_worktree, env=env)
+        # One-tree merge keeps stat data for entries whose content matches
+        git.read_tree("-m", target_index, env=env)
+
+        current_refs = _branch_refs(repo)
+        for name, sha in refs.items():
+            if current_refs.get(name) != sha:
+                git.update_ref(name, sha)
+        for name in current_refs.keys() - refs.keys():
+            git.update_ref("-d", name)
+
+        if head.startswith("ref: "):
+            git.symbolic_ref("HEAD", head[5:])
+        elif head:
+            git.update_ref("--no-deref", "HEAD", head)
+
+        for name in _MERGE_STATE_FILES:
+            (git_dir / name).unlink(missing_ok=True)
+        os.replace(scratch, git_dir / "index")
+    finally:
+        scratch.unlink(missing_ok=True)
+        lock.unlink()
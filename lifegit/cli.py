@@ -1,15 +1,25 @@
 """CLI entry point for Life.git tutorial"""
 
+import json
 import os
+import time
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import typer
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt
+from rich.text import Text
 
-from .git_wrapper import LifeRepo
-from .stages import Act1, Act2
+from . import daemon
+from .output import OutputMode, banner, make_console, resolve_mode
+from .stages import available_acts, get_act
+
+# LifeRepo (and with it GitPython) is imported inside the commands that need
+# it, so calls answered by the resident daemon never pay for the import.
+if TYPE_CHECKING:
+    from .git_wrapper import LifeRepo
 
 app = typer.Typer(
     name="lifegit",
@@ -17,7 +27,49 @@ app = typer.Typer(
     add_completion=False,
     no_args_is_help=True,
 )
-console = Console()
+console = make_console()
+output_mode = OutputMode.AUTO
+
+
+@app.callback()
+def main(
+    output: OutputMode = typer.Option(
+        OutputMode.AUTO,
+        "--output",
+        "-o",
+        help="Output style: rich, compact (ANSI, no boxes) or plain (no escape codes)",
+        case_sensitive=False,
+    ),
+):
+    """Learn git through life decisions"""
+    global console, output_mode
+    console = make_console(output)
+    output_mode = output
+
+
+def _emit_json(console: Console, data: dict):
+    """Write a JSON document to the console's file, bypassing the renderer"""
+    console.file.write(json.dumps(data) + "\n")
+
+
+def _forward(command: str, **args) -> bool:
+    """Let a running daemon answer the command; False if there is none"""
+    reply = daemon.forward(
+        command,
+        args,
+        output=resolve_mode(output_mode).value,
+        terminal=console.is_terminal,
+        width=console.width,
+    )
+    if reply is None:
+        return False
+
+    exit_code, output = reply
+    console.file.write(output)
+    console.file.flush()
+    if exit_code:
+        raise typer.Exit(exit_code)
+    return True
 
 
 def _is_app_root() -> bool:
@@ -42,6 +94,7 @@ def _find_or_create_repo_dir(directory: str | None) -> Path:
             directory = Prompt.ask(
                 "What would you like to name your life journey?",
                 default="my-life",
+                console=console,
             )
             repo_path = cwd / directory
             if not repo_path.exists():
@@ -62,6 +115,7 @@ def _find_or_create_repo_dir(directory: str | None) -> Path:
     name = Prompt.ask(
         "What would you like to name your life journey?",
         default="my-life",
+        console=console,
     )
 
     repo_path = cwd / name
@@ -110,24 +164,37 @@ def start(
     # Change to repo directory so file operations work correctly
     os.chdir(repo_path)
     console.print(f"[dim]Working in: {repo_path}[/dim]")
+    console.print(
+        "[dim]Each step is saved in .git/lifegit so `lifegit rollback` can undo it. "
+        "These snapshots are kept apart from your own commits and never appear in "
+        "git log.[/dim]"
+    )
     console.print()
 
-    # Create repo wrapper (don't auto-init - Act 1 will guide this)
-    repo = LifeRepo(repo_path, auto_init=False)
+    from .git_wrapper import LifeRepo
+
+    # Create repo wrapper (don't auto-init - Act 1 will guide this). Only this
+    # interactive session turns on git's status caches in the student's repo.
+    repo = LifeRepo(repo_path, auto_init=False, status_caches=True)
+
+    from .stages.prefetch import ActPrefetcher
 
     # Run through acts
-    acts = [Act1, Act2]
-    for i, ActClass in enumerate(acts, 1):
-        console.print(f"\n[bold yellow]{'═' * 40}[/bold yellow]")
-        console.print(
-            f"[bold yellow]   ACT {i}: {ActClass.title.upper()}[/bold yellow]"
-        )
-        console.print(f"[bold yellow]{'═' * 40}[/bold yellow]\n")
+    acts = available_acts()
+    prefetch: ActPrefetcher | None = None
+    for i, spec in enumerate(acts, 1):
+        if prefetch is not None:
+            ActClass, initial_state = prefetch.result()
+        else:
+            ActClass, initial_state = spec.load(), None
+        banner(console, f"ACT {spec.number}: {ActClass.title.upper()}")
 
-        act = ActClass(repo, console, advanced=advanced)
+        act = ActClass(repo, console, advanced=advanced, initial_state=initial_state)
         act.run()
 
         if i < len(acts):
+            # Get the next act ready while the student reads the conclusion
+            prefetch = ActPrefetcher(repo, acts[i])
             console.print()
             if not typer.confirm("Ready for the next act?", default=True):
                 console.print(
@@ -153,12 +220,24 @@ def start(
 
 @app.command()
 def validate(
-    act: int = typer.Argument(..., help="Act number to validate (1-2)"),
-    path: Path = typer.Option(Path.cwd(), "--path", "-p", help="Path to repository"),
+    act: int = typer.Argument(..., help="Act number to validate"),
+    path: Path = typer.Option(
+        Path.cwd(),
+        "--path",
+        "-p",
+        help="Path to repository, bare repository or git bundle file",
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Print the result as JSON"),
+    store: Path = typer.Option(
+        None, "--store", help="Also record the result in this results database"
+    ),
 ):
     """Validate your current exercise"""
     # Warn if running from app root without explicit path
     if _is_app_root() and path == Path.cwd():
+        if as_json:
+            _emit_json(console, {"error": "running from the Life.git app directory"})
+            raise typer.Exit(1)
         console.print("[yellow]You're in the Life.git app directory.[/yellow]")
         console.print("[dim]Did you mean to validate your journey folder?[/dim]")
         console.print()
@@ -166,31 +245,106 @@ def validate(
         console.print("Or:  [cyan]lifegit validate 1 --path my-life[/cyan]")
         raise typer.Exit(1)
 
-    repo = LifeRepo(path)
+    # Bundles are opened per call, so they aren't worth sending to the daemon;
+    # recording needs the result here rather than the daemon's printed output
+    is_bundle = path.is_file()
+    if not is_bundle and store is None and _forward(
+        "validate", act=act, path=str(path.resolve()), as_json=as_json
+    ):
+        return
 
-    acts = {1: Act1, 2: Act2}
+    from .git_wrapper import LifeRepo
 
-    if act not in acts:
-        console.print("[red]Act must be 1 or 2 (Acts 3-5 coming soon)[/red]")
+    repo = LifeRepo.open(path)
+    with repo:
+        started = time.perf_counter()
+        complete, failing_check = run_validate(repo, act, as_json, console)
+        if store is not None:
+            from .results import ResultStore
+            from .work_queue import JobResult
+
+            result = JobResult(
+                repo=str(path.resolve()),
+                act=act,
+                passed=complete,
+                duration_ms=(time.perf_counter() - started) * 1000,
+                head_sha=(
+                    repo.repo.head.commit.hexsha
+                    if repo.is_git_repo() and repo.is_initialized()
+                    else None
+                ),
+                failing_check=failing_check,
+            )
+            with ResultStore(store) as results:
+                results.record([result], label="validate")
+
+
+def run_validate(
+    repo: "LifeRepo", act: int, as_json: bool, console: Console
+) -> tuple[bool, str | None]:
+    """Validate one act and report the result (shared with the daemon)
+
+    Returns whether the act is complete and, if not, the check that failed.
+    """
+    from .budget import BUDGET_EXCEEDED, Budget, BudgetExceeded
+    from .stages.base import StageState
+
+    spec = get_act(act)
+
+    if spec is None:
+        if as_json:
+            _emit_json(console, {"error": f"unknown act {act}"})
+            raise typer.Exit(1)
+        known = ", ".join(str(s.number) for s in available_acts())
+        console.print(f"[red]Act must be one of: {known}[/red]")
         raise typer.Exit(1)
 
-    stage = acts[act](repo, console)
+    # Grade the repository as it stands, as if the act started from nothing
+    stage = spec.load()(repo, console, initial_state=StageState())
+    try:
+        with repo.budget(Budget()):
+            complete = stage.validate()
+    except BudgetExceeded as exc:
+        if as_json:
+            _emit_json(
+                console,
+                {
+                    "act": act,
+                    "complete": False,
+                    "failing_check": BUDGET_EXCEEDED,
+                    "error": str(exc),
+                },
+            )
+        else:
+            console.print(f"[red]✗ Act {act} could not be checked: {exc}[/red]")
+        return False, BUDGET_EXCEEDED
 
-    if stage.validate():
+    if as_json:
+        _emit_json(
+            console,
+            {"act": act, "complete": complete, "failing_check": stage.failed_check},
+        )
+    elif complete:
         console.print(f"[green]✓ Act {act} complete![/green]")
     else:
         console.print(f"[red]✗ Act {act} not complete yet[/red]")
         console.print()
         console.print("[dim]Run 'lifegit start' to continue the tutorial.[/dim]")
 
+    return complete, stage.failed_check
+
 
 @app.command()
 def status(
     path: Path = typer.Option(Path.cwd(), "--path", "-p", help="Path to repository"),
+    as_json: bool = typer.Option(False, "--json", help="Print the status as JSON"),
 ):
     """Show your progress through the tutorial"""
     # Warn if running from app root without explicit path
     if _is_app_root() and path == Path.cwd():
+        if as_json:
+            _emit_json(console, {"error": "running from the Life.git app directory"})
+            raise typer.Exit(1)
         console.print("[yellow]You're in the Life.git app directory.[/yellow]")
         console.print("[dim]Did you mean to check your journey folder?[/dim]")
         console.print()
@@ -198,9 +352,20 @@ def status(
         console.print("Or:  [cyan]lifegit status --path my-life[/cyan]")
         raise typer.Exit(1)
 
-    repo = LifeRepo(path)
+    if _forward("status", path=str(path.resolve()), as_json=as_json):
+        return
+
+    from .git_wrapper import LifeRepo
 
-    if not repo.is_initialized():
+    run_status(LifeRepo(path), as_json, console)
+
+
+def run_status(repo: "LifeRepo", as_json: bool, console: Console):
+    """Report progress for one repository (shared with the daemon)"""
+    if not repo.is_git_repo() or not repo.is_initialized():
+        if as_json:
+            _emit_json(console, {"initialized": False})
+            return
         console.print(
             Panel(
                 "[yellow]No commits yet[/yellow]\n\n"
@@ -214,6 +379,19 @@ def status(
     branches = repo.list_branches()
     whatif_branches = [b for b in branches if b.startswith("what-if-")]
 
+    if as_json:
+        _emit_json(
+            console,
+            {
+                "initialized": True,
+                "current_branch": repo.current_branch(),
+                "total_commits": repo.count_commits(),
+                "branches": branches,
+                "whatif_branches": whatif_branches,
+            },
+        )
+        return
+
     console.print(
         Panel(
             f"[cyan]Current branch:[/cyan] {repo.current_branch()}\n"
@@ -226,5 +404,687 @@ def status(
     )
 
 
+@app.command("log")
+def log(
+    path: Path = typer.Option(Path.cwd(), "--path", "-p", help="Path to repository"),
+    all_branches: bool = typer.Option(
+        True, "--all/--current", help="Show every branch or only the current one"
+    ),
+    limit: int = typer.Option(None, "--limit", "-n", help="Show at most this many commits"),
+    skip: int = typer.Option(0, "--skip", help="Skip this many commits first"),
+    pager: bool = typer.Option(True, "--pager/--no-pager", help="Page output one screen at a time"),
+):
+    """Show your life story as a timeline of commits and branches"""
+    import itertools
+
+    from .git_wrapper import LifeRepo
+    from .timeline import page, repo_timeline
+
+    repo = LifeRepo(path)
+    if not repo.is_git_repo() or not repo.is_initialized():
+        console.print("[yellow]No commits yet[/yellow]")
+        raise typer.Exit(1)
+
+    rows = itertools.islice(
+        repo_timeline(repo, all_branches=all_branches),
+        skip,
+        None if limit is None else skip + limit,
+    )
+
+    # Only one screen of rows is read from git and rendered at a time
+    interactive = pager and console.is_terminal and console.is_interactive
+    page_size = max(console.height - 1, 1) if interactive else 200
+    for number, rows_on_page in enumerate(page(rows, page_size)):
+        if number and interactive:
+            answer = console.input("[dim]-- more (Enter, q to quit) --[/dim]")
+            if answer.strip().lower().startswith("q"):
+                break
+        for row in rows_on_page:
+            # Text, not markup: subjects and graph cells may contain [ or a backslash
+            console.print(
+                Text.assemble(
+                    (row.graph, "magenta"),
+                    " ",
+                    (row.sha, "yellow"),
+                    " ",
+                    (row.date, "dim"),
+                    (f" ({', '.join(row.refs)})" if row.refs else "", "bold cyan"),
+                    " ",
+                    row.subject,
+                ),
+                highlight=False,
+                no_wrap=True,
+                overflow="ellipsis",
+            )
+
+
+_CHANGE_STYLES = {"A": "green", "D": "red", "M": "yellow", "T": "yellow", "R": "cyan"}
+
+
+@app.command("compare")
+def compare_branches(
+    other: str = typer.Argument(
+        None, help="Branch to compare (default: every what-if branch)"
+    ),
+    base: str = typer.Option(
+        None, "--base", "-b", help="Branch to compare with (default: main or master)"
+    ),
+    path: Path = typer.Option(Path.cwd(), "--path", "-p", help="Path to repository"),
+    fork_point: bool = typer.Option(
+        False, "--fork-point", help="Only show what changed on the branch since it forked"
+    ),
+    patch: bool = typer.Option(False, "--patch", help="Show the changed lines of each file"),
+    max_paths: int = typer.Option(
+        50, "--max-paths", "-n", help="Stop listing a branch after this many paths"
+    ),
+    renames: bool = typer.Option(True, "--renames/--no-renames", help="Detect renamed files"),
+    as_json: bool = typer.Option(False, "--json", help="Print changes as JSON lines"),
+):
+    """Show how your what-if timelines differ from main"""
+    import difflib
+    import itertools
+
+    from .compare import NoCommonAncestorError
+    from .content import store
+    from .git_wrapper import LifeRepo
+
+    repo = LifeRepo(path)
+    if not repo.is_git_repo() or not repo.is_initialized():
+        console.print("[yellow]No commits yet[/yellow]")
+        raise typer.Exit(1)
+
+    branches = repo.list_branches()
+    if base is None:
+        base = next((b for b in ("main", "master") if b in branches), repo.current_branch())
+    if other is not None:
+        others = [other]
+    else:
+        others = repo.list_branches(prefix=store.current().act2.prompts.branch_prefix)
+    if not others:
+        console.print("[yellow]No what-if branches to compare yet[/yellow]")
+        raise typer.Exit(1)
+    for branch in (base, *others):
+        if not repo.has_branch(branch):
+            console.print(f"[red]No branch named '{branch}'[/red]")
+            raise typer.Exit(1)
+
+    for branch in others:
+        try:
+            changes = repo.compare(base, branch, fork_point=fork_point, renames=renames)
+        except NoCommonAncestorError:
+            console.print(f"[red]'{branch}' has no common ancestor with '{base}'[/red]")
+            raise typer.Exit(1)
+        shown = list(itertools.islice(changes, max_paths + 1))
+        truncated = len(shown) > max_paths
+        shown = shown[:max_paths]
+        changes.close()  # stops git if there was more to list
+
+        if as_json:
+            for change in shown:
+                _emit_json(
+                    console,
+                    {
+                        "repo": str(repo.path),
+                        "base": base,
+                        "branch": branch,
+                        "status": change.status,
+                        "path": change.path,
+                        "old_path": change.old_path,
+                        "similarity": change.similarity,
+                    },
+                )
+            continue
+
+        console.print(f"\n[bold]{base}[/bold] → [bold]{branch}[/bold]")
+        if not shown:
+            console.print("  [dim]No differences[/dim]")
+        for change in shown:
+            label = change.path
+            if change.old_path is not None:
+                label = f"{change.old_path} → {change.path} ({change.similarity}%)"
+            console.print(
+                Text.assemble("  ", (change.status, _CHANGE_STYLES[change.status]), " ", label)
+            )
+            if not patch:
+                continue
+            old, new = repo.read_blob(change.old_blob), repo.read_blob(change.new_blob)
+            if (old is None and change.old_blob) or (new is None and change.new_blob):
+                console.print("    [dim](binary)[/dim]")
+                continue
+            diff = difflib.unified_diff(
+                (old or "").splitlines(), (new or "").splitlines(), lineterm="", n=1
+            )
+            for line in itertools.islice(diff, 2, None):  # skip the ---/+++ header
+                style = {"+": "green", "-": "red", "@": "cyan"}.get(line[:1], "")
+                console.print(Text("    " + line, style=style), highlight=False)
+        if truncated:
+            console.print("  [dim]… more paths; raise --max-paths to see them[/dim]")
+
+
+@app.command()
+def practice(
+    directory: Path = typer.Argument(..., help="Directory for the practice sandbox"),
+    template: Path = typer.Option(
+        None, "--template", "-t", help="Repository to copy history from"
+    ),
+    reset: bool = typer.Option(
+        False, "--reset", help="Reset an existing sandbox to its template state"
+    ),
+):
+    """Create or reset a disposable practice repository"""
+    from .git_wrapper import LifeRepo
+
+    if reset:
+        repo = LifeRepo(directory)
+        if not repo.is_git_repo() or not repo.is_sandbox():
+            console.print(f"[red]'{directory}' is not a practice sandbox[/red]")
+            raise typer.Exit(1)
+        repo.reset_sandbox()
+        console.print(f"[green]Sandbox '{directory}' reset to its template[/green]")
+        return
+
+    if template is None:
+        console.print("[red]Pass --template to create a new sandbox[/red]")
+        raise typer.Exit(1)
+
+    if directory.exists() and any(directory.iterdir()):
+        console.print(f"[red]Directory '{directory}' already exists and is not empty[/red]")
+        raise typer.Exit(1)
+
+    repo = LifeRepo.from_template(template, directory)
+    console.print(
+        f"[green]Created practice sandbox '{directory}' "
+        f"on branch {repo.current_branch()}[/green]"
+    )
+    console.print(f"[dim]Start over any time with: lifegit practice {directory} --reset[/dim]")
+
+
+@app.command()
+def maintain(
+    path: Path = typer.Option(Path.cwd(), "--path", "-p", help="Path to repository"),
+    force: bool = typer.Option(False, "--force", help="Run every task, due or not"),
+    benchmark: bool = typer.Option(
+        False, "--benchmark", help="Time history queries before and after"
+    ),
+):
+    """Write the commit-graph and multi-pack-index so history queries stay fast"""
+    from rich.table import Table
+
+    from . import maintenance
+    from .git_wrapper import LifeRepo
+
+    repo = LifeRepo(path)
+    if not repo.is_git_repo() or not repo.is_initialized():
+        console.print("[yellow]No commits yet[/yellow]")
+        raise typer.Exit(1)
+
+    before = maintenance.benchmark(repo) if benchmark else None
+    tasks = repo.maintain(force=force)
+    if tasks:
+        console.print(f"[green]Ran: {', '.join(tasks)}[/green]")
+    else:
+        console.print("[dim]Nothing was due[/dim]")
+
+    if before is not None:
+        after = maintenance.benchmark(repo)
+        table = Table(title="Best of 5, milliseconds")
+        table.add_column("Query")
+        table.add_column("Before", justify="right")
+        table.add_column("After", justify="right")
+        table.add_column("Speedup", justify="right")
+        for old, new in zip(before, after):
+            table.add_row(
+                old.query,
+                f"{old.milliseconds:.1f}",
+                f"{new.milliseconds:.1f}",
+                f"{old.milliseconds / max(new.milliseconds, 1e-6):.1f}x",
+            )
+        console.print(table)
+
+
+@app.command()
+def rollback(
+    checkpoint: str = typer.Argument(
+        "0", help="Checkpoint number from --list (0 is the newest) or SHA prefix"
+    ),
+    path: Path = typer.Option(Path.cwd(), "--path", "-p", help="Path to repository"),
+    list_only: bool = typer.Option(False, "--list", "-l", help="List checkpoints"),
+):
+    """Put your repo back the way it was at an earlier step"""
+    from rich.table import Table
+
+    from .checkpoints import CheckpointError
+    from .git_wrapper import LifeRepo, RepoLockedError
+
+    repo = LifeRepo(path)
+    if not repo.is_git_repo():
+        console.print("[yellow]Not a git repository[/yellow]")
+        raise typer.Exit(1)
+
+    if list_only:
+        table = Table()
+        table.add_column("#", justify="right")
+        table.add_column("Checkpoint")
+        table.add_column("Taken")
+        table.add_column("Step")
+        for i, cp in enumerate(repo.list_checkpoints()):
+            taken = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(cp.timestamp))
+            table.add_row(str(i), cp.sha[:7], taken, cp.label)
+        console.print(table)
+        return
+
+    try:
+        target = repo.find_checkpoint(checkpoint)
+        repo.restore_checkpoint(target)
+    except (CheckpointError, RepoLockedError) as exc:
+        console.print(f"[red]{exc}[/red]")
+        raise typer.Exit(1)
+    console.print(f"[green]Restored {target.sha[:7]}: {target.label}[/green]")
+    console.print("[dim]Changed your mind? `lifegit rollback` undoes this too.[/dim]")
+
+
+@app.command("daemon")
+def run_daemon(
+    socket: Path = typer.Option(
+        None, "--socket", help="Unix socket to listen on (default: per-user runtime dir)"
+    ),
+    idle_timeout: float = typer.Option(
+        daemon.DEFAULT_IDLE_TIMEOUT,
+        "--idle-timeout",
+        help="Exit after this many seconds without requests",
+    ),
+    max_repos: int = typer.Option(
+        daemon.DEFAULT_MAX_REPOS,
+        "--max-repos",
+        help="Number of repositories to keep open",
+    ),
+    stop: bool = typer.Option(False, "--stop", help="Stop a running daemon"),
+):
+    """Keep a resident process so validate and status answer instantly"""
+    if not daemon.supported():
+        console.print("[yellow]The daemon needs Unix sockets, which this platform lacks[/yellow]")
+        raise typer.Exit(1)
+    path = socket or daemon.socket_path()
+
+    if stop:
+        if daemon.forward("shutdown", {}, socket=path) is None:
+            console.print("[yellow]No daemon is running[/yellow]")
+            raise typer.Exit(1)
+        console.print("[green]Daemon stopped[/green]")
+        return
+
+    try:
+        server = daemon.LifegitDaemon(path, max_repos=max_repos, idle_timeout=idle_timeout)
+    except daemon.DaemonRunningError:
+        console.print(f"[yellow]A daemon is already listening on {path}[/yellow]")
+        raise typer.Exit(1)
+    except daemon.UnsafeSocketError as exc:
+        console.print(f"[red]Other users can write {exc}; choose another --socket[/red]")
+        raise typer.Exit(1)
+
+    console.print(f"[dim]Listening on {path} (idle timeout {idle_timeout:g}s)[/dim]")
+    server.serve()
+
+
+grade_app = typer.Typer(help="Grade a cohort of repositories, on one or many machines")
+app.add_typer(grade_app, name="grade")
+
+QUEUE_OPTION = typer.Option(
+    "grading.db", "--queue", "-q", help="Queue location (SQLite file or backend URL)"
+)
+STORE_OPTION = typer.Option(
+    Path("results.db"), "--store", "-s", help="Results database to query or record into"
+)
+
+
+@grade_app.command("enqueue")
+def grade_enqueue(
+    cohort: Path = typer.Argument(..., help="Directory holding one repo or bundle per student"),
+    acts: list[int] = typer.Option([1, 2], "--act", "-a", help="Acts to validate"),
+    queue: str = QUEUE_OPTION,
+):
+    """Queue every repository in a cohort for grading"""
+    from .grading import enqueue_cohort
+    from .work_queue import open_queue
+
+    added = enqueue_cohort(open_queue(queue), cohort, tuple(acts))
+    console.print(f"[green]Queued {added} new repositories[/green]")
+
+
+@grade_app.command("work")
+def grade_work(
+    queue: str = QUEUE_OPTION,
+    processes: int = typer.Option(1, "--processes", "-n", help="Worker processes to run"),
+    wait: bool = typer.Option(False, "--wait", help="Keep polling for new jobs"),
+):
+    """Pull jobs from the queue and grade them"""
+    from .grading import run_worker, run_workers
+    from .work_queue import open_queue
+
+    if processes > 1:
+        run_workers(queue, processes, wait=wait)
+    else:
+
+        def report(job, results):
+            passed = sum(r.passed for r in results)
+            console.print(f"[dim]{job.id}: {passed}/{len(results)} acts passed[/dim]")
+
+        run_worker(open_queue(queue), wait=wait, on_result=report)
+
+    _print_progress(open_queue(queue).progress())
+
+
+@grade_app.command("progress")
+def grade_progress(
+    queue: str = QUEUE_OPTION,
+    as_json: bool = typer.Option(False, "--json", help="Print the counts as JSON"),
+):
+    """Show how many jobs are pending, running, done and failed"""
+    from .work_queue import open_queue
+
+    progress = open_queue(queue).progress()
+    if as_json:
+        _emit_json(
+            console,
+            {
+                "pending": progress.pending,
+                "running": progress.running,
+                "done": progress.done,
+                "failed": progress.failed,
+            },
+        )
+        return
+    _print_progress(progress)
+
+
+@grade_app.command("results")
+def grade_results(
+    queue: str = QUEUE_OPTION,
+    as_json: bool = typer.Option(False, "--json", help="Print results as JSON lines"),
+):
+    """List grading results collected so far"""
+    from .work_queue import open_queue
+
+    for result in open_queue(queue).results():
+        if as_json:
+            _emit_json(
+                console,
+                {
+                    "repo": result.repo,
+                    "act": result.act,
+                    "passed": result.passed,
+                    "duration_ms": round(result.duration_ms, 2),
+                    "head_sha": result.head_sha,
+                    "failing_check": result.failing_check,
+                    "error": result.error,
+                },
+            )
+        elif result.passed:
+            console.print(f"[green]✓[/green] {result.repo} act {result.act}")
+        else:
+            reason = result.error or result.failing_check
+            reason = f" [dim]({reason})[/dim]" if reason else ""
+            console.print(f"[red]✗[/red] {result.repo} act {result.act}{reason}")
+
+
+@grade_app.command("collect")
+def grade_collect(
+    queue: str = QUEUE_OPTION,
+    store: Path = STORE_OPTION,
+    label: str = typer.Option(None, "--label", help="Name for this grading run"),
+):
+    """Copy the queue's results into the results database as a new run"""
+    from .results import ResultStore
+    from .work_queue import open_queue
+
+    collected = open_queue(queue).results()
+    with ResultStore(store) as results:
+        run_id, recorded = results.record(collected, label=label or queue)
+    console.print(f"[green]Recorded {recorded} results as run {run_id}[/green]")
+
+
+def _print_progress(progress):
+    console.print(
+        f"[cyan]{progress.done}/{progress.total} done[/cyan], "
+        f"{progress.pending} pending, {progress.running} running, "
+        f"[red]{progress.failed} failed[/red]"
+    )
+
+
+cohort_app = typer.Typer(help="Export and summarize commit metadata across a cohort")
+app.add_typer(cohort_app, name="cohort")
+
+
+@cohort_app.command("export")
+def cohort_export(
+    cohort: Path = typer.Argument(..., help="Directory holding one repo or bundle per student"),
+    output: Path = typer.Option(
+        Path("cohort.npz"), "--output", "-o", help="Column file to write"
+    ),
+    processes: int = typer.Option(
+        None, "--processes", "-n", help="Parallel extractors (default: one per CPU)"
+    ),
+):
+    """Extract commit and branch metadata from every repository into columns"""
+    from .analytics import AnalyticsUnavailable, export_cohort
+
+    try:
+        exported, failed = export_cohort(cohort, output, processes)
+    except AnalyticsUnavailable as exc:
+        console.print(f"[red]{exc}[/red]")
+        raise typer.Exit(1)
+
+    console.print(f"[green]Exported {exported} repositories to {output}[/green]")
+    if failed:
+        console.print(f"[yellow]{failed} repositories could not be read[/yellow]")
+
+
+@cohort_app.command("stats")
+def cohort_stats(
+    export: Path = typer.Argument(Path("cohort.npz"), help="Column file from 'cohort export'"),
+    as_json: bool = typer.Option(False, "--json", help="Print the statistics as JSON"),
+):
+    """Show distributions of commits, gaps, branches and act completion"""
+    from rich.table import Table
+
+    from .analytics import AnalyticsUnavailable, PERCENTILES, cohort_stats, load_columns
+
+    try:
+        stats = cohort_stats(load_columns(export))
+    except AnalyticsUnavailable as exc:
+        console.print(f"[red]{exc}[/red]")
+        raise typer.Exit(1)
+
+    if as_json:
+        _emit_json(console, stats)
+        return
+
+    completion = stats.pop("completion")
+    table = Table(title=f"Cohort of {completion['repositories']} repositories")
+    table.add_column("Metric")
+    for column in ("mean", *(f"p{p}" for p in PERCENTILES)):
+        table.add_column(column, justify="right")
+    for metric, summary in stats.items():
+        cells = [summary.get(c) for c in ("mean", *(f"p{p}" for p in PERCENTILES))]
+        table.add_row(metric, *("-" if c is None else f"{c:.1f}" for c in cells))
+    console.print(table)
+    console.print(
+        f"Act 1 complete: {completion['act 1']}, act 2 complete: {completion['act 2']}, "
+        f"unreadable: {completion['errors']}"
+    )
+
+
+results_app = typer.Typer(help="Query grading history recorded in a results database")
+app.add_typer(results_app, name="results")
+
+
+@results_app.command("not-passed")
+def results_not_passed(
+    act: int = typer.Argument(..., help="Act number"),
+    store: Path = STORE_OPTION,
+    as_json: bool = typer.Option(False, "--json", help="Print repositories as JSON"),
+):
+    """List repositories whose latest result for an act is not a pass"""
+    from .results import ResultStore
+
+    with ResultStore(store) as results:
+        repos = results.not_passed(act)
+
+    if as_json:
+        _emit_json(console, {"act": act, "repos": repos})
+        return
+    for repo in repos:
+        console.print(repo)
+    console.print(f"[dim]{len(repos)} repositories have not passed Act {act}[/dim]")
+
+
+@results_app.command("regressions")
+def results_regressions(
+    store: Path = STORE_OPTION,
+    run: int = typer.Option(None, "--run", help="Run to check (default: latest)"),
+    since: int = typer.Option(
+        None, "--since", help="Run to compare with (default: each repo's previous result)"
+    ),
+    as_json: bool = typer.Option(False, "--json", help="Print regressions as JSON lines"),
+):
+    """List acts that passed in one run and fail in the next"""
+    from .results import ResultStore
+
+    with ResultStore(store) as results:
+        regressions = results.regressions(run, since)
+
+    for regression in regressions:
+        if as_json:
+            _emit_json(
+                console,
+                {
+                    "repo": regression.repo,
+                    "act": regression.act,
+                    "failing_check": regression.failing_check,
+                    "head_sha": regression.head_sha,
+                },
+            )
+        else:
+            check = regression.failing_check or "error"
+            console.print(
+                f"[red]✗[/red] {regression.repo} act {regression.act} [dim]({check})[/dim]"
+            )
+    if not as_json:
+        console.print(f"[dim]{len(regressions)} regressions[/dim]")
+
+
+@results_app.command("history")
+def results_history(
+    repo: Path = typer.Argument(..., help="Repository, bare repository or bundle"),
+    store: Path = STORE_OPTION,
+):
+    """Show every recorded result for one repository"""
+    from datetime import datetime
+
+    from .results import ResultStore
+
+    with ResultStore(store) as results:
+        history = results.history(str(repo.resolve()))
+
+    for run_id, act, passed, failing_check, graded_at in history:
+        when = datetime.fromtimestamp(graded_at).strftime("%Y-%m-%d %H:%M")
+        mark = "[green]✓[/green]" if passed else "[red]✗[/red]"
+        reason = f" [dim]({failing_check})[/dim]" if failing_check else ""
+        console.print(f"{mark} run {run_id} [dim]{when}[/dim] act {act}{reason}")
+
+
+similar_app = typer.Typer(help="Find near-duplicate decision files across cohorts")
+app.add_typer(similar_app, name="similar")
+
+INDEX_OPTION = typer.Option(
+    Path("similarity.db"), "--index", help="SQLite similarity index"
+)
+THRESHOLD_OPTION = typer.Option(
+    0.8, "--threshold", "-t", min=0.0, max=1.0, help="Minimum estimated similarity"
+)
+
+
+@similar_app.command("index")
+def similar_index(
+    cohort: Path = typer.Argument(..., help="Directory holding one repo or bundle per student"),
+    index: Path = INDEX_OPTION,
+    processes: int = typer.Option(
+        None, "--processes", "-n", help="Parallel readers (default: one per CPU)"
+    ),
+    templates: list[Path] = typer.Option(
+        [], "--template", help="Starter text handed out to students; copies of it are ignored"
+    ),
+):
+    """Add a cohort's decision files to the index, rehashing only changed ones"""
+    from .similarity import SimilarityIndex
+
+    with SimilarityIndex(index) as similarity:
+        for template in templates:
+            try:
+                similarity.add_template(template.read_text(errors="replace"))
+            except ValueError as exc:
+                console.print(f"[red]{template}: {exc}[/red]")
+                raise typer.Exit(1)
+        indexed, hashed, failed = similarity.index_cohort(cohort, processes)
+        total = len(similarity)
+
+    console.print(
+        f"[green]Indexed {indexed} repositories[/green] "
+        f"[dim]({hashed} files hashed, {total} in the index)[/dim]"
+    )
+    if failed:
+        console.print(f"[yellow]{failed} repositories could not be read[/yellow]")
+
+
+@similar_app.command("duplicates")
+def similar_duplicates(
+    index: Path = INDEX_OPTION,
+    threshold: float = THRESHOLD_OPTION,
+    as_json: bool = typer.Option(False, "--json", help="Print pairs as JSON lines"),
+):
+    """List pairs of files from different repositories that look copied"""
+    from .similarity import SimilarityIndex
+
+    with SimilarityIndex(index) as similarity:
+        matches = similarity.duplicates(threshold)
+
+    for match in matches:
+        if as_json:
+            _emit_json(
+                console,
+                {
+                    "repo": match.repo,
+                    "path": match.path,
+                    "other_repo": match.other_repo,
+                    "other_path": match.other_path,
+                    "similarity": match.similarity,
+                },
+            )
+        else:
+            console.print(
+                f"[bold]{match.similarity:.0%}[/bold] {match.repo} [dim]{match.path}[/dim]"
+                f" ~ {match.other_repo} [dim]{match.other_path}[/dim]"
+            )
+    if not as_json:
+        console.print(f"[dim]{len(matches)} pairs at or above {threshold:.0%}[/dim]")
+
+
+@similar_app.command("query")
+def similar_query(
+    file: Path = typer.Argument(..., help="Text file to look up"),
+    index: Path = INDEX_OPTION,
+    threshold: float = THRESHOLD_OPTION,
+):
+    """List indexed files similar to a given file"""
+    from .similarity import SimilarityIndex
+
+    with SimilarityIndex(index) as similarity:
+        hits = similarity.query(file.read_text(errors="replace"), threshold)
+
+    for hit in hits:
+        console.print(f"[bold]{hit.similarity:.0%}[/bold] {hit.repo} [dim]{hit.path}[/dim]")
+    console.print(f"[dim]{len(hits)} files at or above {threshold:.0%}[/dim]")
+
+
 if __name__ == "__main__":
     app()
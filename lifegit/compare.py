@@ -0,0 +1,140 @@
+"""Tree-level comparison of two branches
+
+``iter_changes`` streams ``git diff-tree -r -z`` output and yields one
+TreeChange per changed path as git reports it, so the first changes can
+be shown before git has finished walking a large tree. Only object names
+are read: blob contents are loaded by ``read_blob`` for the paths actually
+displayed. Rename detection is capped with ``-l``; past the cap git stops
+pairing renames and reports them as a deletion plus an addition.
+
+A finished comparison is cached under its pair of tree SHAs. Trees are
+content-addressed, so the cache holds across branches, commits and even
+repositories with identical trees, which is common when grading a cohort.
+"""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass
+from io import BufferedReader
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .git_wrapper import LifeRepo
+
+# Files considered for rename pairing; git's own default is 1000
+RENAME_LIMIT = 200
+CACHE_SIZE = 256
+MAX_BLOB_BYTES = 1024 * 1024
+_CHUNK = 64 * 1024
+_NULL_SHA = frozenset({"0" * 40, "0" * 64})
+
+
+class NoCommonAncestorError(ValueError):
+    """Raised when a fork-point comparison joins branches with unrelated histories"""
+
+
+@dataclass(frozen=True, slots=True)
+class TreeChange:
+    """One path that differs between two trees"""
+
+    status: str  # A, D, M, T (type change), R (renamed)
+    path: str
+    old_path: str | None = None  # set for renames only
+    old_blob: str | None = None  # None when added
+    new_blob: str | None = None  # None when deleted
+    similarity: int | None = None  # rename score, 0-100
+
+
+_cache: OrderedDict[tuple, tuple[TreeChange, ...]] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _cached(key: tuple) -> tuple[TreeChange, ...] | None:
+    with _cache_lock:
+        changes = _cache.get(key)
+        if changes is not None:
+            _cache.move_to_end(key)
+        return changes
+
+
+def _remember(key: tuple, changes: tuple[TreeChange, ...]):
+    with _cache_lock:
+        _cache[key] = changes
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def clear_cache():
+    """Forget every cached comparison"""
+    with _cache_lock:
+        _cache.clear()
+
+
+def _fields(stream: BufferedReader) -> Iterator[str]:
+    """NUL-separated fields of a stream, as soon as each arrives"""
+    pending = b""
+    while chunk := stream.read1(_CHUNK):
+        *complete, pending = (pending + chunk).split(b"\0")
+        for field in complete:
+            yield field.decode(errors="surrogateescape")
+    if pending:
+        yield pending.decode(errors="surrogateescape")
+
+
+def _parse(fields: Iterator[str]) -> Iterator[TreeChange]:
+    """TreeChanges from ``diff-tree --raw -z`` fields"""
+    for header in fields:
+        _old_mode, _new_mode, old_blob, new_blob, status = header.lstrip(":").split(" ")
+        old_blob = None if old_blob in _NULL_SHA else old_blob
+        new_blob = None if new_blob in _NULL_SHA else new_blob
+        if status[0] in "RC":
+            old_path, path = next(fields), next(fields)
+            yield TreeChange("R", path, old_path, old_blob, new_blob, int(status[1:] or 0))
+        else:
+            yield TreeChange(status[0], next(fields), None, old_blob, new_blob)
+
+
+def iter_changes(
+    repo: "LifeRepo",
+    old_tree: str,
+    new_tree: str,
+    renames: bool = True,
+    rename_limit: int = RENAME_LIMIT,
+) -> Iterator[TreeChange]:
+    """Stream the paths that differ between two trees
+
+    A comparison read to the end is cached; one abandoned part way stops
+    git and is not.
+    """
+    key = (old_tree, new_tree, rename_limit if renames else 0)
+    if (cached := _cached(key)) is not None:
+        yield from cached
+        return
+
+    args = ["-r", "-z", "--no-commit-id"]
+    if renames:
+        args += ["-M", f"-l{rename_limit}"]
+    process = repo.repo.git.diff_tree(*args, old_tree, new_tree, as_process=True)
+    changes = []
+    try:
+        for change in _parse(_fields(process.stdout)):
+            changes.append(change)
+            yield change
+    except BaseException:  # including GeneratorExit when the caller stops early
+        process.proc.kill()
+        process.proc.wait()
+        raise
+    process.wait()  # raises GitCommandError if git failed
+    _remember(key, tuple(changes))
+
+
+def read_blob(repo: "LifeRepo", sha: str | None, limit: int = MAX_BLOB_BYTES) -> str | None:
+    """Text of a blob, cut at limit bytes; None for binary or missing blobs"""
+    if sha is None:
+        return None
+    data = repo.repo.odb.stream(bytes.fromhex(sha)).read(limit)
+    if b"\0" in data[:8000]:
+        return None
+    return data.decode(errors="replace")
@@ -1,67 +1,161 @@
-"""Load story content from TOML with ergonomic attribute access"""
-
+"""Load story content from TOML with ergonomic attribute access
+
+``store`` holds the current Content and checks content.toml for changes
+(at most once per CHECK_INTERVAL seconds) whenever it is asked for it. A
+changed file is parsed and compared act by act; only acts whose tables
+differ are rebuilt, and the new version replaces the old in one
+assignment. A Content never changes once built, so a stage holding one
+sees the same text until it asks the store again at its next step. A file
+that fails to parse is reported in ``store.last_error`` and the previous
+version stays in use.
+"""
+
+import threading
+import time
 import tomllib
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, make_dataclass
+from functools import cache
 from pathlib import Path
 
 type TomlValue = str | int | float | bool | list[TomlValue] | dict[str, TomlValue]
 
 _DEFAULT_PATH = Path(__file__).parent / "content.toml"
 
+# Seconds between checks of the file's stat data
+CHECK_INTERVAL = 1.0
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Narrative:
     introduction: str
     conclusion: str
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Prompts:
+    """Instructions and hints for an act
+
+    Act-specific keys (e.g. ``file_name``) are real fields on a subclass
+    built for that act's set of keys; names that aren't defined read as None.
+    """
+
     instructions: str
-    hints: list[str]
-    _extra: dict[str, TomlValue] = field(default_factory=dict, repr=False)
+    hints: tuple[str, ...]
 
     def __getattr__(self, name: str) -> TomlValue | None:
+        # Only reached for names that aren't fields
         if name.startswith("_"):
             raise AttributeError(name)
-        return self._extra.get(name)
+        return None
+
 
+@cache
+def _prompts_type(extra_keys: tuple[str, ...]) -> type[Prompts]:
+    """Slotted Prompts subclass with a field for each act-specific key"""
+    return make_dataclass(
+        "Prompts",
+        [(key, TomlValue) for key in extra_keys],
+        bases=(Prompts,),
+        frozen=True,
+        slots=True,
+        module=__name__,
+    )
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class Act:
     narrative: Narrative
     prompts: Prompts
 
 
-@dataclass
+def _build_act(data: dict[str, TomlValue]) -> Act:
+    prompts_raw = dict(data["prompts"])
+    instructions = prompts_raw.pop("instructions")
+    hints = tuple(prompts_raw.pop("hints"))
+    prompts_type = _prompts_type(tuple(sorted(prompts_raw)))
+    return Act(
+        narrative=Narrative(**data["narrative"]),
+        prompts=prompts_type(instructions, hints, **prompts_raw),
+    )
+
+
+@dataclass(frozen=True)
 class Content:
-    _path: Path = field(default=_DEFAULT_PATH, repr=False)
-    _acts: dict[str, Act] = field(init=False, repr=False)
-
-    def __post_init__(self):
-        with self._path.open("rb") as f:
-            raw = tomllib.load(f)
-
-        self._acts = {}
-        for key, data in raw.items():
-            prompts_raw = data["prompts"]
-            self._acts[key] = Act(
-                narrative=Narrative(**data["narrative"]),
-                prompts=Prompts(
-                    instructions=prompts_raw["instructions"],
-                    hints=prompts_raw["hints"],
-                    _extra={
-                        k: v
-                        for k, v in prompts_raw.items()
-                        if k not in ("instructions", "hints")
-                    },
-                ),
-            )
+    """One version of the story content; acts read as attributes (content.act1)"""
+
+    version: int = 0
+    _acts: dict[str, Act] = field(default_factory=dict, repr=False)
 
     def __getattr__(self, name: str) -> Act:
-        if name in self._acts:
+        # Only reached for names that aren't fields
+        if not name.startswith("_") and name in self._acts:
             return self._acts[name]
         raise AttributeError(name)
 
 
-content = Content()
+def _stamp(path: Path) -> tuple[int, int, int]:
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size, st.st_ino
+
+
+class ContentStore:
+    """The current Content for a TOML file, replaced when the file changes"""
+
+    def __init__(self, path: Path = _DEFAULT_PATH, check_interval: float = CHECK_INTERVAL):
+        self.path = Path(path)
+        self.check_interval = check_interval
+        self.last_error: Exception | None = None
+        self._lock = threading.Lock()
+        self._content = Content()
+        self._raw: dict[str, TomlValue] = {}
+        self._stamp: tuple[int, int, int] | None = None
+        self._checked_at = time.monotonic()
+        self.reload()
+
+    def current(self) -> Content:
+        """The latest version, reloading first if the file has changed"""
+        now = time.monotonic()
+        if now - self._checked_at >= self.check_interval:
+            self._checked_at = now
+            try:
+                if _stamp(self.path) != self._stamp:
+                    self.reload()
+            except (
+                OSError,
+                UnicodeDecodeError,
+                tomllib.TOMLDecodeError,
+                KeyError,
+                TypeError,
+            ) as exc:
+                self.last_error = exc
+        return self._content
+
+    def reload(self) -> frozenset[str]:
+        """Parse the file and swap in a new version; return the acts that changed
+
+        Raises if the file can't be read or doesn't have the expected
+        shape; the previous version then stays current.
+        """
+        with self._lock:
+            # Stamp before reading: a write during the read triggers another reload
+            stamp = _stamp(self.path)
+            self._stamp = stamp
+            raw = tomllib.loads(self.path.read_text(encoding="utf-8"))
+
+            acts = {}
+            changed = set(self._raw.keys() - raw.keys())
+            for key, data in raw.items():
+                if key in self._raw and self._raw[key] == data:
+                    acts[key] = self._content._acts[key]
+                else:
+                    acts[key] = _build_act(data)
+                    changed.add(key)
+
+            if changed:
+                self._content = Content(self._content.version + 1, acts)
+                self._raw = raw
+            self.last_error = None
+            return frozenset(changed)
+
+
+store = ContentStore()
@@ -0,0 +1,277 @@
+"""Resident daemon that answers validate/status without interpreter startup
+
+The daemon listens on a Unix socket and keeps imports, parsed content and
+open LifeRepo handles warm between requests. The CLI forwards commands to
+it when the socket exists and falls back to running in-process otherwise.
+
+Protocol: the client sends one JSON line ``{"command", "args", "output",
+"terminal", "width"}`` and reads back ``{"exit_code", "output"}``.
+
+The socket lives in a directory only its user can write, and the client
+only talks to a socket owned by that same user, so another account on a
+shared machine can't stand in for the daemon. Platforms without Unix
+sockets (Windows) always run commands in-process.
+"""
+
+import io
+import json
+import os
+import socket as sockets
+import socketserver
+import stat
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .git_wrapper import LifeRepo
+
+DEFAULT_IDLE_TIMEOUT = 600.0
+DEFAULT_MAX_REPOS = 32
+
+CONNECT_TIMEOUT = 0.5
+REPLY_TIMEOUT = 60.0
+
+
+# Missing where Unix sockets are (Windows); supported() is then False
+_UnixServer = getattr(socketserver, "ThreadingUnixStreamServer", object)
+
+
+class DaemonRunningError(RuntimeError):
+    """Raised when another daemon already answers on the socket"""
+
+
+class UnsafeSocketError(RuntimeError):
+    """Raised when another user could write the socket's directory"""
+
+
+def supported() -> bool:
+    """Whether this platform has Unix sockets and user ids"""
+    return hasattr(sockets, "AF_UNIX") and hasattr(os, "getuid")
+
+
+def socket_path() -> Path:
+    """Per-user socket location, overridable with LIFEGIT_SOCKET"""
+    if env := os.environ.get("LIFEGIT_SOCKET"):
+        return Path(env)
+    if runtime_dir := os.environ.get("XDG_RUNTIME_DIR"):
+        return Path(runtime_dir) / f"lifegit-{os.getuid()}.sock"
+    # The temp dir is shared, so the socket gets a private directory in it
+    return Path(tempfile.gettempdir()) / f"lifegit-{os.getuid()}" / "daemon.sock"
+
+
+def _private_dir(path: Path) -> bool:
+    """Check that a directory belongs to this user and no one else can write it"""
+    try:
+        st = path.lstat()
+    except OSError:
+        return False
+    return stat.S_ISDIR(st.st_mode) and st.st_uid == os.getuid() and not st.st_mode & 0o022
+
+
+def _trusted(path: Path) -> bool:
+    """Check that a socket was made by this user in a directory only they control"""
+    try:
+        st = path.lstat()
+    except OSError:
+        return False
+    return (
+        stat.S_ISSOCK(st.st_mode)
+        and st.st_uid == os.getuid()
+        and _private_dir(path.parent)
+    )
+
+
+def forward(
+    command: str,
+    args: dict,
+    output: str = "auto",
+    terminal: bool = False,
+    width: int = 80,
+    socket: Path | None = None,
+) -> tuple[int, str] | None:
+    """Send a command to a running daemon
+
+    Returns (exit_code, output), or None if no daemon answered, in which
+    case the caller should run the command itself. Setting LIFEGIT_NO_DAEMON
+    disables forwarding.
+    """
+    if os.environ.get("LIFEGIT_NO_DAEMON") or not supported():
+        return None
+
+    path = socket or socket_path()
+    if not _trusted(path):
+        return None
+
+    request = {
+        "command": command,
+        "args": args,
+        "output": output,
+        "terminal": terminal,
+        "width": width,
+    }
+    try:
+        with sockets.socket(sockets.AF_UNIX, sockets.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(str(path))
+            sock.settimeout(REPLY_TIMEOUT)
+            sock.sendall(json.dumps(request).encode() + b"\n")
+            with sock.makefile("rb") as reply_file:
+                reply = json.loads(reply_file.read())
+    except (OSError, ValueError):
+        return None
+
+    return reply["exit_code"], reply["output"]
+
+
+class RepoCache:
+    """LRU cache of open LifeRepo handles keyed by resolved path"""
+
+    def __init__(self, max_size: int = DEFAULT_MAX_REPOS):
+        from .git_wrapper import LifeRepo
+
+        self._factory = LifeRepo
+        self._max_size = max_size
+        self._repos: OrderedDict[Path, "LifeRepo"] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path: Path) -> "LifeRepo":
+        """Return the cached handle for path, opening it if needed"""
+        path = path.resolve()
+        with self._lock:
+            repo = self._repos.get(path)
+            # A folder that wasn't a repository yet may have been initialized since
+            if repo is None or not repo.is_git_repo():
+                repo = self._factory(path)
+                self._repos[path] = repo
+            self._repos.move_to_end(path)
+
+            while len(self._repos) > self._max_size:
+                _, evicted = self._repos.popitem(last=False)
+                evicted.close()
+
+            return repo
+
+    def clear(self):
+        """Close every cached handle"""
+        with self._lock:
+            for repo in self._repos.values():
+                repo.close()
+            self._repos.clear()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        reply = self.server.dispatch(request)
+        self.wfile.write(json.dumps(reply).encode())
+
+
+class LifegitDaemon(_UnixServer):
+    """Unix socket server running validate/status against warm state"""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        path: Path,
+        max_repos: int = DEFAULT_MAX_REPOS,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ):
+        self.path = Path(path)
+        self.idle_timeout = idle_timeout
+        self.repos = RepoCache(max_repos)
+        self._last_request = time.monotonic()
+
+        self.path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if not _private_dir(self.path.parent):
+            raise UnsafeSocketError(str(self.path.parent))
+        if self.path.exists():
+            if forward("ping", {}, socket=self.path) is not None:
+                raise DaemonRunningError(str(self.path))
+            self.path.unlink()  # stale socket left by a crashed daemon
+
+        super().__init__(str(self.path), _RequestHandler)
+        os.chmod(self.path, 0o600)
+        self._warm_up()
+
+    def _warm_up(self):
+        """Import everything a request needs before the first one arrives"""
+        from . import cli, content  # noqa: F401
+        from .stages import available_acts
+
+        for spec in available_acts():
+            spec.load()
+
+    def serve(self):
+        """Serve until stopped or idle for longer than idle_timeout"""
+        watcher = threading.Thread(target=self._watch_idle, daemon=True)
+        watcher.start()
+        try:
+            self.serve_forever()
+        finally:
+            self.server_close()
+            self.repos.clear()
+            self.path.unlink(missing_ok=True)
+
+    def _watch_idle(self):
+        while True:
+            time.sleep(min(self.idle_timeout, 5.0))
+            if time.monotonic() - self._last_request > self.idle_timeout:
+                self.shutdown()
+                return
+
+    def dispatch(self, request: dict) -> dict:
+        """Run one forwarded command and capture what it printed"""
+        import typer
+
+        from . import cli
+        from .output import OutputMode, make_console
+
+        self._last_request = time.monotonic()
+        command = request.get("command")
+        args = request.get("args", {})
+
+        if command == "ping":
+            return {"exit_code": 0, "output": ""}
+        if command == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"exit_code": 0, "output": ""}
+
+        buffer = io.StringIO()
+        console = make_console(
+            OutputMode(request.get("output", "auto")),
+            file=buffer,
+            force_terminal=request.get("terminal", False),
+            width=request.get("width", 80),
+        )
+
+        def report(error: str):
+            if args.get("as_json"):
+                cli._emit_json(console, {"error": error})
+            else:
+                console.print(f"[red]{error}[/red]")
+
+        exit_code = 0
+        try:
+            repo = self.repos.get(Path(args["path"]))
+            if command == "validate":
+                cli.run_validate(repo, args["act"], args["as_json"], console)
+            elif command == "status":
+                cli.run_status(repo, args["as_json"], console)
+            else:
+                report(f"Unknown daemon command: {command}")
+                exit_code = 2
+        except typer.Exit as exc:
+            exit_code = exc.exit_code
+        except Exception as exc:  # report instead of killing the connection
+            report(f"{type(exc).__name__}: {exc}")
+            exit_code = 1
+
+        return {"exit_code": exit_code, "output": buffer.getvalue()}
@@ -0,0 +1,80 @@
+"""Memo of facts derived from a repository, checked against stat stamps
+
+Validators, hints, status output and conclusions ask LifeRepo the same
+questions (which branches exist, what HEAD is, how many commits) many
+times over a session. Each answer is kept together with the stat stamps
+of the files it was derived from (HEAD, packed-refs, the files under
+refs/), taken before it was computed. An answer is reused only while
+those stamps are unchanged. git replaces these files by renaming a lock
+file over them, so any write, from lifegit or from a git run in another
+terminal, gives them a new inode and a new stamp.
+
+Set LIFEGIT_NO_FACT_CACHE=1 to compute every fact afresh.
+"""
+
+import os
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from typing import Any
+
+FACT_CACHE_SIZE = 256
+
+MISSING = object()
+
+
+def enabled() -> bool:
+    """Whether LifeRepo may reuse facts"""
+    return not os.environ.get("LIFEGIT_NO_FACT_CACHE")
+
+
+@dataclass(frozen=True, slots=True)
+class FactCacheStats:
+    """Counters for one repository's fact cache"""
+
+    hits: int
+    misses: int
+    invalidations: int  # misses caused by a changed stamp
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class FactCache:
+    """Bounded LRU of (stamp, value) entries"""
+
+    def __init__(self, max_entries: int = FACT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[Hashable, Any]] = OrderedDict()
+        self._hits = self._misses = self._invalidations = 0
+
+    def lookup(self, key: Hashable, stamp: Hashable) -> Any:
+        """The value stored under key if its stamp still matches, else MISSING"""
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == stamp:
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+        if entry is not None:
+            del self._entries[key]
+            self._invalidations += 1
+        self._misses += 1
+        return MISSING
+
+    def store(self, key: Hashable, stamp: Hashable, value: Any):
+        self._entries[key] = (stamp, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> FactCacheStats:
+        return FactCacheStats(
+            self._hits, self._misses, self._invalidations, len(self._entries)
+        )
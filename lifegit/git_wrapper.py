@@ -1,17 +1,122 @@
 """Wrapper around GitPython for Life.git tutorial"""
 
+import contextlib
+import functools
+import itertools
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
 from pathlib import Path
 
-from git import Repo
-from git.exc import InvalidGitRepositoryError
+from git import Git, Repo
+from git.exc import GitCommandError, InvalidGitRepositoryError
+
+from . import checkpoints, compare, facts, index_reader, maintenance, reflog
+from .checkpoints import Checkpoint
+from .compare import MAX_BLOB_BYTES, RENAME_LIMIT, NoCommonAncestorError, TreeChange
+from .facts import FactCache, FactCacheStats
+from .gitparse import (
+    LOCK_FILES,
+    LOCK_RETRY_DELAYS,
+    WorkingTreeStatus,
+    is_lock_error,
+    parse_status,
+)
+from .budget import Budget, BudgetMeter
+from .index_reader import ConflictEntry
+from .reflog import ReflogEntry, ReflogIndex
+
+# Sandboxes remember the template's branch tips under this namespace so a
+# reset can put them back without consulting the template again
+TEMPLATE_REFS = "refs/lifegit/template"
+TEMPLATE_HEAD = "refs/lifegit/template-HEAD"
+
+
+class RepoLockedError(RuntimeError):
+    """Raised when git's lock files stay held for the whole retry schedule"""
+
+
+@functools.cache
+def _has_builtin_fsmonitor() -> bool:
+    """Check if the installed git ships the built-in fsmonitor daemon"""
+    return "fsmonitor--daemon" in Git().version("--build-options")
+
+
+def _stamp(path: Path) -> tuple[int, int, int] | None:
+    """Identify a file's current version by inode, size and mtime"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def _synchronized(method):
+    """Serialize calls on one LifeRepo so threads can share it"""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _fact(*sources: str):
+    """Reuse a method's result while its sources ("head", "refs") are unchanged
+
+    Apply below _synchronized. Lists are copied on the way out so callers
+    can't alter the cached one.
+    """
+
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self._repo is None or not self._facts_enabled:
+                return method(self, *args, **kwargs)
+
+            key = (method.__name__, args, tuple(sorted(kwargs.items())))
+            # Stamp first: a change while computing must invalidate the result
+            stamp = self._source_stamp(sources)
+            value = self._facts.lookup(key, stamp)
+            if value is facts.MISSING:
+                value = method(self, *args, **kwargs)
+                self._facts.store(key, stamp, value)
+            elif (meter := self._meter()) is not None:
+                meter.check()  # nothing walked, but the budget still holds
+            return list(value) if isinstance(value, list) else value
+
+        return wrapper
+
+    return decorate
 
 
 class LifeRepo:
-    """Abstraction over GitPython providing clean interface for tutorial operations"""
+    """Abstraction over GitPython providing clean interface for tutorial operations
 
-    def __init__(self, path: Path = Path.cwd(), auto_init: bool = False):
+    A single instance may be shared between threads (for example a watcher
+    polling validate() and the UI thread). Calls are serialized, and
+    operations touching the index back off while a git process started
+    elsewhere holds index.lock or HEAD.lock.
+    """
+
+    def __init__(
+        self, path: Path = Path.cwd(), auto_init: bool = False, status_caches: bool = False
+    ):
         self.path = Path(path)
+        # Only interactive sessions opt in: enabling writes to .git/config
+        self._status_caches = status_caches
         self._repo: Repo | None = None
+        self._lock = threading.RLock()
+        # Waiting on this releases _lock, so retries don't stall other threads
+        self._backoff = threading.Condition(self._lock)
+        self._temp_dir: tempfile.TemporaryDirectory | None = None
+        self._budgets = threading.local()
+        self._maintenance_checked: float | None = None
+        self._facts = FactCache()
+        self._facts_enabled = facts.enabled()
 
         try:
             self._repo = Repo(path)
@@ -20,6 +125,9 @@ class LifeRepo:
                 self._repo = Repo.init(path)
             # Otherwise leave _repo as None until init() is called
 
+        if self._repo is not None and status_caches:
+            self._enable_status_caches()
+
     @property
     def repo(self) -> Repo:
         """Get the underlying Repo object (raises if not initialized)"""
@@ -31,95 +139,607 @@ class LifeRepo:
         """Check if this path is a git repository"""
         return self._repo is not None
 
+    @_synchronized
     def init(self) -> "LifeRepo":
         """Initialize a new git repository"""
         self._repo = Repo.init(self.path)
+        if self._status_caches:
+            self._enable_status_caches()
+        return self
+
+    def _enable_status_caches(self):
+        """Turn on git's untracked cache, and fsmonitor where git supports it
+
+        With these, ``git status`` only revisits directories that changed
+        since the last run instead of walking the whole working tree.
+        Settings the student configured themselves are left alone, and a
+        config that can't be written (read-only .git) just goes without.
+        """
+        if self._repo.bare:
+            return
+
+        wanted = {"untrackedCache": "true"}
+        if _has_builtin_fsmonitor():
+            wanted["fsmonitor"] = "true"
+
+        try:
+            reader = self._repo.config_reader("repository")
+            for key, value in wanted.items():
+                if not reader.has_option("core", key):
+                    self._repo.git.config(f"core.{key}", value)
+        except (GitCommandError, OSError):
+            pass
+
+    def is_bare(self) -> bool:
+        """Check if there is no working tree (bare repository or bundle)"""
+        return self.repo.bare
+
+    @_synchronized
+    def close(self):
+        """Release the git processes GitPython keeps open for this repo"""
+        if self._repo is not None:
+            self._repo.close()
+        if self._temp_dir is not None:
+            self._temp_dir.cleanup()
+            self._temp_dir = None
+
+    def __enter__(self) -> "LifeRepo":
         return self
 
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Resource budgets
+
+    @contextlib.contextmanager
+    def budget(self, budget: Budget) -> Iterator[BudgetMeter]:
+        """Charge this thread's walks against budget until the block exits
+
+        Raises BudgetExceeded from whichever operation crosses a limit.
+        """
+        previous = getattr(self._budgets, "meter", None)
+        self._budgets.meter = meter = BudgetMeter(budget)
+        try:
+            yield meter
+        finally:
+            self._budgets.meter = previous
+
+    def _meter(self) -> BudgetMeter | None:
+        return getattr(self._budgets, "meter", None)
+
+    def _charge(self, objects: int):
+        if (meter := self._meter()) is not None:
+            meter.charge(objects)
+
+    def _git(self, command: str, *args: str) -> str:
+        """Run a git command, killed if it outlives the active budget"""
+        meter = self._meter()
+        if meter is None:
+            return getattr(self.repo.git, command)(*args)
+
+        meter.check()
+        try:
+            return getattr(self.repo.git, command)(
+                *args, kill_after_timeout=meter.remaining_seconds()
+            )
+        except GitCommandError:
+            meter.check()  # a process killed for time becomes BudgetExceeded
+            raise
+
+    # Grading from bundles
+
+    @classmethod
+    def from_bundle(cls, bundle: Path) -> "LifeRepo":
+        """Open a ``git bundle`` for validation without checking it out
+
+        The bundle's refs and objects are fetched into a temporary bare
+        repository (no working tree is written) that is removed on close().
+        Working-tree questions are then answered from the tip commit's tree.
+        """
+        bundle = Path(bundle).resolve()
+        temp_dir = tempfile.TemporaryDirectory(prefix="lifegit-bundle-")
+        bare = Repo.init(temp_dir.name, bare=True)
+        bare.git.fetch(str(bundle), "+refs/*:refs/*")
+
+        bundle_refs = {}
+        for line in bare.git.bundle("list-heads", str(bundle)).splitlines():
+            sha, refname = line.split(" ", 1)
+            bundle_refs[refname] = sha
+        head_sha = bundle_refs.get("HEAD")
+        branches = [head.name for head in bare.heads]
+        preferred = [b for b in ("main", "master") if b in branches] + branches
+        matching = [b for b in preferred if bare.heads[b].commit.hexsha == head_sha]
+
+        if matching or (head_sha is None and preferred):
+            bare.git.symbolic_ref("HEAD", f"refs/heads/{(matching or preferred)[0]}")
+        elif head_sha is not None:
+            bare.git.update_ref("--no-deref", "HEAD", head_sha)
+
+        repo = cls(Path(temp_dir.name))
+        repo._temp_dir = temp_dir
+        return repo
+
+    @classmethod
+    def open(cls, location: Path) -> "LifeRepo":
+        """Open a submission: a repository, a bare repository or a bundle file"""
+        location = Path(location)
+        return cls.from_bundle(location) if location.is_file() else cls(location)
+
+    # Concurrency with external git processes
+
+    def is_locked(self) -> bool:
+        """Check if another git process currently holds the index or HEAD lock"""
+        git_dir = Path(self.repo.git_dir)
+        return any((git_dir / name).exists() for name in LOCK_FILES)
+
+    def _retrying(self, operation, write: bool = False):
+        """Run operation, backing off while another git process holds a lock
+
+        Writes also wait for the lock files to disappear before trying, so
+        we don't race the student's own git commands for the index. Other
+        threads may use the repo while we back off.
+        """
+        last_error: Exception | None = None
+        for delay in (0, *LOCK_RETRY_DELAYS):
+            if delay:
+                with self._backoff:
+                    self._backoff.wait(delay)
+            if write and self.is_locked():
+                continue
+            try:
+                return operation()
+            except (GitCommandError, OSError) as exc:
+                if not is_lock_error(exc):
+                    raise
+                last_error = exc
+
+        raise RepoLockedError(
+            f"Repository at {self.path} stayed locked by another git process"
+        ) from last_error
+
+    def _index_fingerprint(self) -> tuple[int, int, int] | None:
+        """Identify the current index file version (None if there is no index)"""
+        return _stamp(Path(self.repo.git_dir) / "index")
+
+    def _refs_stamps(self) -> tuple:
+        """Stat stamps of packed-refs and every ref file outside refs/lifegit
+
+        Checkpoint refs are left out: they move at every step without
+        changing anything a fact is derived from.
+        """
+        common_dir = Path(self._repo.common_dir)
+        refs = common_dir / "refs"
+        stamps = [
+            _stamp(common_dir / "packed-refs"),
+            _stamp(common_dir / "reftable" / "tables.list"),
+        ]
+        # Directory stamps catch deleted refs, file stamps moved ones
+        for root, dirs, files in os.walk(refs):
+            dirs[:] = sorted(d for d in dirs if not (root == str(refs) and d == "lifegit"))
+            stamps.append((root, _stamp(Path(root))))
+            stamps.extend((name, _stamp(Path(root) / name)) for name in sorted(files))
+        return tuple(stamps)
+
+    def _source_stamp(self, sources: tuple[str, ...]) -> tuple:
+        """Current stamps of the named fact sources ("head", "refs")"""
+        stamps = []
+        for source in sources:
+            if source == "head":
+                stamps.append(_stamp(Path(self._repo.git_dir) / "HEAD"))
+            else:
+                stamps.append(self._refs_stamps())
+        return tuple(stamps)
+
+    def fingerprint(self) -> tuple | None:
+        """Stat stamps of HEAD, the index, packed-refs and every ref
+
+        Commits, checkouts, staging and branch changes all rewrite one of
+        these files, so equal fingerprints mean none of them happened in
+        between. Costs one stat per ref; no git process is started.
+        None if there is no repository yet.
+        """
+        if self._repo is None:
+            return None
+        return (
+            _stamp(Path(self._repo.git_dir) / "HEAD"),
+            self._index_fingerprint(),
+            self._refs_stamps(),
+        )
+
+    def fact_cache_stats(self) -> FactCacheStats:
+        """Hit and miss counters of the memo behind branch and commit queries"""
+        return self._facts.stats()
+
+    # Practice sandboxes
+
+    @classmethod
+    def from_template(cls, template: Path, path: Path) -> "LifeRepo":
+        """Create a practice sandbox from a template repository
+
+        The sandbox borrows the template's object store through git
+        alternates instead of copying it, so creation time depends on the
+        number of branches and the size of the checked-out tree, not on
+        the length of the template's history. The template must therefore
+        stay in place (and must not be pruned) while sandboxes use it.
+        """
+        source = Repo(template)
+        if not source.heads:
+            raise ValueError(f"Template has no branches: {template}")
+
+        sandbox = Repo.init(path)
+        alternates = Path(sandbox.git_dir) / "objects" / "info" / "alternates"
+        alternates.write_text(f"{Path(source.common_dir).resolve() / 'objects'}\n")
+
+        for head in source.heads:
+            sha = head.commit.hexsha
+            sandbox.git.update_ref(f"refs/heads/{head.name}", sha)
+            sandbox.git.update_ref(f"{TEMPLATE_REFS}/{head.name}", sha)
+
+        default = source.heads[0] if source.head.is_detached else source.active_branch
+        sandbox.git.symbolic_ref(TEMPLATE_HEAD, f"refs/heads/{default.name}")
+        sandbox.git.symbolic_ref("HEAD", f"refs/heads/{default.name}")
+        sandbox.git.reset("--hard")
+
+        return cls(path)
+
+    @_synchronized
+    def is_sandbox(self) -> bool:
+        """Check if this repository was created from a practice template"""
+        try:
+            self.repo.git.symbolic_ref("-q", TEMPLATE_HEAD)
+        except GitCommandError:
+            return False
+        return True
+
+    @_synchronized
+    def reset_sandbox(self):
+        """Put a practice sandbox back to the template's state
+
+        Branches are restored from the recorded template tips, branches
+        created since are deleted, and the working tree is reset. Only
+        files that differ from the template are rewritten.
+        """
+        if not self.is_sandbox():
+            raise RuntimeError(f"Not a practice sandbox: {self.path}")
+
+        listing = self.repo.git.for_each_ref(
+            "--format=%(refname) %(objectname)", TEMPLATE_REFS
+        )
+        template_tips = {}
+        for line in listing.splitlines():
+            refname, sha = line.split()
+            template_tips[refname.removeprefix(f"{TEMPLATE_REFS}/")] = sha
+        default = self.repo.git.symbolic_ref(TEMPLATE_HEAD)
+
+        # Detach first so the current branch can be moved or deleted
+        self.repo.git.checkout("--detach", "--quiet")
+        for head in self.repo.heads:
+            if head.name not in template_tips:
+                self.repo.git.branch("-D", head.name)
+        for name, sha in template_tips.items():
+            self.repo.git.update_ref(f"refs/heads/{name}", sha)
+
+        self.repo.git.symbolic_ref("HEAD", default)
+        self.repo.git.reset("--hard")
+        self.repo.git.clean("-fd")
+
     # Core operations
 
+    @_synchronized
     def commit(self, message: str, files: list[str] | None = None):
         """Commit with optional file staging"""
-        if files:
-            self.repo.index.add(files)
-        return self.repo.index.commit(message)
 
+        def commit_index():
+            index = self.repo.index
+            if files:
+                index.add(files)
+            return index.commit(message)
+
+        return self._retrying(commit_index, write=True)
+
+    @_synchronized
     def create_branch(self, name: str):
         """Create a new branch"""
-        return self.repo.create_head(name)
+        return self._retrying(lambda: self.repo.create_head(name), write=True)
 
+    @_synchronized
     def checkout(self, branch: str):
         """Switch to a branch"""
-        self.repo.heads[branch].checkout()
+        self._retrying(self.repo.heads[branch].checkout, write=True)
 
+    @_synchronized
     def merge(self, branch: str):
         """Merge another branch into current"""
-        return self.repo.git.merge(branch)
+        return self._retrying(lambda: self.repo.git.merge(branch), write=True)
+
+    @_synchronized
+    def maintain(self, force: bool = False) -> tuple[str, ...]:
+        """Write the commit-graph and multi-pack-index if due; return tasks run"""
+        return maintenance.maintain(self, force=force)
+
+    @_synchronized
+    def maintain_if_due(self) -> tuple[str, ...]:
+        """Opportunistic maintenance, checking the object store at most once a minute
+
+        Loose objects and a stale commit-graph come from the student's own
+        git commands as much as ours, so the signals are read rather than
+        our writes counted.
+        """
+        now = time.monotonic()
+        checked = self._maintenance_checked
+        if checked is not None and now - checked < maintenance.CHECK_INTERVAL_SECONDS:
+            return ()
+        self._maintenance_checked = now
+        return maintenance.maintain_quietly(self)
+
+    # Checkpoints
+
+    @_synchronized
+    def checkpoint(self, label: str) -> Checkpoint:
+        """Record refs, HEAD, index and working tree as a restorable checkpoint"""
+        return self._retrying(lambda: checkpoints.take(self, label), write=True)
+
+    def list_checkpoints(self) -> list[Checkpoint]:
+        """Checkpoints taken in this repo, newest first"""
+        return checkpoints.history(self)
+
+    def find_checkpoint(self, selector: str) -> Checkpoint:
+        """Look up a checkpoint by position (0 is the newest) or SHA prefix"""
+        return checkpoints.find(self, selector)
+
+    @_synchronized
+    def restore_checkpoint(self, checkpoint: Checkpoint):
+        """Put the repo back as it was when checkpoint was taken
+
+        The current state is checkpointed first, once, so the restore can
+        be undone; only the restore itself is retried while locked.
+        """
+        try:
+            self.checkpoint(f"before restoring {checkpoint.sha[:7]}")
+        except checkpoints.CheckpointError:
+            pass  # a conflicted index can't be recorded, but can still be replaced
+        self._retrying(lambda: checkpoints.restore(self, checkpoint), write=True)
+
+    # Branch comparison
+
+    def compare(
+        self,
+        base: str,
+        other: str,
+        fork_point: bool = False,
+        renames: bool = True,
+        rename_limit: int = RENAME_LIMIT,
+    ) -> Iterator[TreeChange]:
+        """Stream the paths whose content differs between two branches
+
+        With fork_point, other is compared with the commit it forked from
+        (``base...other``), so only changes made on other show up, and
+        NoCommonAncestorError is raised if the branches share no history.
+        Blob contents are not read; see read_blob.
+
+        Only the trees are resolved under the lock; the changes stream from
+        a git process of their own while the caller iterates.
+        """
+        with self._lock:
+            if fork_point:
+                try:
+                    base = self._git("merge-base", base, other)
+                except GitCommandError as exc:
+                    if exc.status != 1:  # 1 with no output: nothing in common
+                        raise
+                    raise NoCommonAncestorError(
+                        f"'{base}' and '{other}' have no common ancestor"
+                    ) from None
+            old_tree, new_tree = self._git(
+                "rev-parse", f"{base}^{{tree}}", f"{other}^{{tree}}"
+            ).split()
+        return compare.iter_changes(self, old_tree, new_tree, renames, rename_limit)
+
+    @_synchronized
+    def read_blob(self, sha: str | None, limit: int = MAX_BLOB_BYTES) -> str | None:
+        """Text of a blob from a TreeChange; None for binary or missing blobs"""
+        return compare.read_blob(self, sha, limit)
 
     # Validation helpers
 
-    def count_commits(self, branch: str | None = None) -> int:
-        """Count commits on a branch"""
+    @_synchronized
+    @_fact("head", "refs")
+    def count_commits(self, branch: str | None = None, limit: int | None = None) -> int:
+        """Count commits on a branch, stopping the walk at limit if given
+
+        ``count_commits(limit=n + 1) > n`` answers "more than n commits?"
+        without walking the rest of the history.
+        """
         if not self.repo.heads:
             return 0
         ref = branch if branch else "HEAD"
-        return len(list(self.repo.iter_commits(ref)))
 
+        meter = self._meter()
+        if meter is not None and meter.remaining_objects() is not None:
+            # One commit past the budget is enough to know it was exceeded
+            over = meter.remaining_objects() + 1
+            limit = over if limit is None else min(limit, over)
+
+        args = ["--count", ref] if limit is None else ["--count", f"--max-count={limit}", ref]
+        count = int(self._git("rev_list", *args))
+        self._charge(count)
+        return count
+
+    @_synchronized
+    @_fact("head", "refs")
     def get_last_commit_message(self) -> str:
         """Get the most recent commit message"""
         if not self.repo.heads:
             return ""
         return str(self.repo.head.commit.message).strip()
 
+    @_synchronized
     def stage_files(self, files: list[str]):
         """Stage files for commit"""
-        self.repo.index.add(files)
+        self._retrying(lambda: self.repo.index.add(files), write=True)
+
+    @_synchronized
+    def status(self) -> WorkingTreeStatus:
+        """Staged, unstaged, untracked and conflicted paths from one ``git status``
+
+        Callers needing more than one of these should call this once and
+        read the fields, rather than using the properties below. A bare
+        repository has no working tree and reports an empty status.
+
+        Untracked files are listed the way ``git status`` shows them, with
+        a new directory as a single ``dir/`` entry: that is the mode git's
+        untracked cache serves, so repeated calls skip unchanged directories.
+        """
+        if self.is_bare():
+            return WorkingTreeStatus()
+        output = self._retrying(
+            lambda: self.repo.git.status(
+                "--porcelain=v2", "-z", "--untracked-files=normal"
+            )
+        )
+        return parse_status(output)
 
     @property
     def untracked_files(self) -> list[str]:
-        """List of untracked files"""
-        return self.repo.untracked_files
+        """List of untracked files (a new directory counts once, as "dir/")"""
+        return list(self.status().untracked)
 
     @property
-    def staged_files(self) -> list[str | None]:
+    def staged_files(self) -> list[str]:
         """List of staged files"""
-        if not self.is_initialized():
-            return [str(entry[0]) for entry in self.repo.index.entries]
-        return [item.a_path for item in self.repo.index.diff("HEAD")]
+        return list(self.status().staged)
 
     def has_uncommitted_changes(self) -> bool:
         """Check for uncommitted changes (staged or unstaged)"""
-        return self.repo.is_dirty(untracked_files=True)
+        return self.status().is_dirty
 
     def has_untracked_files(self) -> bool:
         """Check for untracked files"""
-        return len(self.untracked_files) > 0
+        return bool(self.status().untracked)
 
+    @_synchronized
+    @_fact("head")
     def current_branch(self) -> str:
         """Get name of current branch"""
         if self.repo.head.is_detached:
             return "(detached HEAD)"
         return self.repo.active_branch.name
 
-    def list_branches(self) -> list[str]:
-        """Get all branch names"""
-        return [head.name for head in self.repo.heads]
+    @_synchronized
+    @_fact("refs")
+    def list_branches(self, prefix: str = "", limit: int | None = None) -> list[str]:
+        """Get branch names, optionally only those starting with prefix"""
+        args = ["--format=%(refname:lstrip=2)"]
+        if limit is not None:
+            args.append(f"--count={limit}")
+        pattern = f"refs/heads/{prefix}*" if prefix else "refs/heads"
+        names = self._git("for_each_ref", *args, pattern).splitlines()
+        self._charge(len(names))
+        return names
+
+    @_synchronized
+    @_fact("refs")
+    def has_branch(self, name: str) -> bool:
+        """Check for one branch without listing the others"""
+        try:
+            self._git("show_ref", "--verify", "--quiet", f"refs/heads/{name}")
+        except GitCommandError:
+            return False
+        return True
+
+    @_synchronized
+    def is_ancestor(self, ancestor: str, descendant: str) -> bool:
+        """Check if ancestor is reachable from descendant, walking only in git"""
+        try:
+            self._git("merge_base", "--is-ancestor", ancestor, descendant)
+        except GitCommandError as exc:
+            if exc.status == 1:
+                return False
+            raise
+        return True
 
+    def _hash_size(self) -> int:
+        """Object name length in bytes (SHA-1 or SHA-256 repositories)"""
+        reader = self.repo.config_reader("repository")
+        object_format = reader.get_value("extensions", "objectformat", "sha1")
+        return 32 if object_format == "sha256" else 20
+
+    @_synchronized
     def has_conflicts(self) -> bool:
         """Check if there are merge conflicts"""
-        return len(self.repo.index.unmerged_blobs()) > 0
+        return index_reader.has_unmerged(
+            Path(self.repo.git_dir) / "index", self._hash_size()
+        )
+
+    @_synchronized
+    def conflicts(self) -> list[ConflictEntry]:
+        """Unmerged paths with their stages and whether markers remain"""
+        return index_reader.conflict_inventory(
+            Path(self.repo.git_dir) / "index", self.path, self._hash_size()
+        )
+
+    def _reflog_path(self, ref: str) -> Path:
+        """Location of a ref's log (HEAD's is per worktree, branches' are shared)"""
+        base = self.repo.git_dir if ref == "HEAD" else self.repo.common_dir
+        return Path(base) / "logs" / ref
+
+    def iter_reflog(self, ref: str = "HEAD") -> Iterator[ReflogEntry]:
+        """Stream reflog entries for a ref, newest first"""
+        return reflog.iter_reflog(self._reflog_path(ref))
 
+    def reflog_index(self, ref: str = "HEAD") -> ReflogIndex:
+        """Indexed lookups (by SHA, by action) over a ref's reflog"""
+        return ReflogIndex(self._reflog_path(ref))
+
+    @_synchronized
     def get_reflog(self, n: int = 10) -> list[str]:
         """Get recent reflog entries"""
-        return self.repo.git.reflog(f"-{n}").split("\n")
+        return [
+            f"{entry.new_sha[:7]} HEAD@{{{i}}}: {entry.message}"
+            for i, entry in enumerate(itertools.islice(self.iter_reflog(), n))
+        ]
+
+    @_synchronized
+    def file_exists(self, filename: str) -> bool:
+        """Check if a file exists in the working tree
+
+        Without a working tree (bare repository or bundle) the tip commit's
+        tree stands in for it.
+        """
+        if not self.is_bare():
+            return (self.path / filename).exists()
+        if not self.is_initialized():
+            return False
+        try:
+            self.repo.head.commit.tree[filename]
+        except KeyError:
+            return False
+        return True
 
+    @_synchronized
     def file_in_last_commit(self, filename: str) -> bool:
-        """Check if a file was modified in the last commit"""
+        """Check if a file was modified in the last commit
+
+        Compares the file's tree entry with the parent's, so no blob is read
+        however large the file is.
+        """
         if not self.repo.heads:
             return False
         last_commit = self.repo.head.commit
-        return filename in last_commit.stats.files
 
+        def entry(tree) -> bytes | None:
+            try:
+                return (tree / filename).binsha
+            except KeyError:
+                return None
+
+        current = entry(last_commit.tree)
+        if not last_commit.parents:
+            return current is not None
+        return current != entry(last_commit.parents[0].tree)
+
+    @_synchronized
+    @_fact("refs")
     def is_initialized(self) -> bool:
         """Check if repo has at least one commit"""
         return len(self.repo.heads) > 0
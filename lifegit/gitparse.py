@@ -0,0 +1,71 @@
+"""Shared readers for git's output, used by LifeRepo and AsyncLifeRepo
+
+Both wrappers run the same git commands, one through GitPython and one
+through asyncio subprocesses, and hand the output and errors here, so the
+two can't disagree about what a status line or a lock failure means.
+"""
+
+import re
+from dataclasses import dataclass
+
+from git.exc import GitCommandError
+
+# Back-off schedule (seconds) while another git process holds a lock file
+LOCK_RETRY_DELAYS = (0.05, 0.1, 0.2, 0.4, 0.8, 1.6)
+LOCK_FILES = ("index.lock", "HEAD.lock")
+
+# What git prints (exit status 128) when it finds another process's lock file
+LOCK_HELD_MESSAGE = re.compile(r"Unable to create '[^']+\.lock': File exists")
+
+
+def is_lock_error(exc: Exception) -> bool:
+    """Check if a git or filesystem error was caused by a held lock file"""
+    if isinstance(exc, GitCommandError):
+        return exc.status == 128 and bool(LOCK_HELD_MESSAGE.search(str(exc.stderr)))
+    # GitPython re-raises its own FileExistsError on a lock file as OSError
+    cause = exc if isinstance(exc, FileExistsError) else exc.__cause__
+    return isinstance(cause, FileExistsError) and str(cause.filename).endswith(".lock")
+
+
+@dataclass(frozen=True, slots=True)
+class WorkingTreeStatus:
+    """Result of a single ``git status`` run"""
+
+    staged: tuple[str, ...] = ()
+    unstaged: tuple[str, ...] = ()
+    untracked: tuple[str, ...] = ()  # a wholly untracked directory is one "dir/" entry
+    conflicted: tuple[str, ...] = ()
+
+    @property
+    def is_dirty(self) -> bool:
+        """Anything staged, modified, untracked or conflicted"""
+        return bool(self.staged or self.unstaged or self.untracked or self.conflicted)
+
+
+def parse_status(output: str) -> WorkingTreeStatus:
+    """Parse ``git status --porcelain=v2 -z`` output"""
+    staged, unstaged, untracked, conflicted = [], [], [], []
+    fields = iter(output.split("\0"))
+
+    for entry in fields:
+        if not entry:
+            continue
+        kind = entry[0]
+        if kind == "?":
+            untracked.append(entry[2:])
+        elif kind == "u":
+            conflicted.append(entry.split(" ", 10)[10])
+        elif kind in ("1", "2"):
+            if kind == "1":
+                xy, path = entry[2:4], entry.split(" ", 8)[8]
+            else:
+                xy, path = entry[2:4], entry.split(" ", 9)[9]
+                next(fields, None)  # renames carry the original path as an extra field
+            if xy[0] != ".":
+                staged.append(path)
+            if xy[1] != ".":
+                unstaged.append(path)
+
+    return WorkingTreeStatus(
+        tuple(staged), tuple(unstaged), tuple(untracked), tuple(conflicted)
+    )
@@ -0,0 +1,144 @@
+"""Batch grading: validate many student repositories, locally or across machines
+
+A coordinator turns a cohort directory into one queue job per repository.
+Workers on any number of machines claim jobs, validate the requested acts
+and report results back to the queue.
+"""
+
+import multiprocessing
+import os
+import socket
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from rich.console import Console
+
+from .budget import BUDGET_EXCEEDED, Budget, BudgetExceeded
+from .work_queue import Job, JobQueue, JobResult, open_queue
+
+IDLE_POLL_SECONDS = 2.0
+
+
+def find_repos(cohort: Path) -> list[Path]:
+    """Student submissions in a cohort: repositories, bare repos and bundles"""
+    found = []
+    for entry in sorted(cohort.iterdir()):
+        if entry.is_file() and entry.suffix == ".bundle":
+            found.append(entry)
+        elif (entry / ".git").exists() or (entry / "HEAD").is_file():
+            found.append(entry)
+    return found
+
+
+def grade_repo(
+    location: Path, acts: tuple[int, ...], budget: Budget = Budget()
+) -> list[JobResult]:
+    """Validate the given acts against one repository, bare repo or bundle
+
+    Each act runs under its own budget; one that runs out is reported as
+    failing the ``budget-exceeded`` check.
+    """
+    from .git_wrapper import LifeRepo
+    from .stages import get_act
+    from .stages.base import StageState
+
+    quiet = Console(quiet=True)
+    repo = LifeRepo.open(location)
+    results = []
+
+    with repo:
+        head_sha = (
+            repo.repo.head.commit.hexsha
+            if repo.is_git_repo() and repo.is_initialized()
+            else None
+        )
+        for act in acts:
+            started = time.perf_counter()
+            passed, failing_check, error = False, None, None
+            try:
+                spec = get_act(act)
+                if spec is None:
+                    error = f"unknown act {act}"
+                else:
+                    stage = spec.load()(repo, quiet, initial_state=StageState())
+                    with repo.budget(budget):
+                        passed = stage.validate()
+                    failing_check = stage.failed_check
+            except BudgetExceeded as exc:
+                failing_check, error = BUDGET_EXCEEDED, str(exc)
+            except Exception as exc:  # one broken repo must not stop the batch
+                error = f"{type(exc).__name__}: {exc}"
+
+            results.append(
+                JobResult(
+                    repo=str(location),
+                    act=act,
+                    passed=passed,
+                    duration_ms=(time.perf_counter() - started) * 1000,
+                    head_sha=head_sha,
+                    failing_check=failing_check,
+                    error=error,
+                )
+            )
+
+    return results
+
+
+def enqueue_cohort(queue: JobQueue, cohort: Path, acts: tuple[int, ...]) -> int:
+    """Shard a cohort into one job per repository; return how many were new"""
+    jobs = [Job(id=str(path.resolve()), acts=acts) for path in find_repos(cohort)]
+    return queue.enqueue(jobs)
+
+
+def run_worker(
+    queue: JobQueue,
+    worker: str | None = None,
+    wait: bool = False,
+    on_result: Callable[[Job, list[JobResult]], None] | None = None,
+) -> int:
+    """Grade jobs until the queue is drained; return how many were graded
+
+    With wait=True the worker keeps polling for new jobs instead of
+    exiting once nothing is pending.
+    """
+    worker = worker or f"{socket.gethostname()}-{os.getpid()}"
+    graded = 0
+
+    while True:
+        job = queue.claim(worker)
+        if job is None:
+            if wait or queue.progress().running:
+                # Other workers' leases may still expire and come back
+                time.sleep(IDLE_POLL_SECONDS)
+                if not wait and queue.progress().finished:
+                    return graded
+                continue
+            return graded
+
+        try:
+            results = grade_repo(Path(job.id), job.acts)
+        except Exception as exc:
+            queue.fail(job, worker, f"{type(exc).__name__}: {exc}")
+            continue
+
+        queue.complete(job, worker, results)
+        graded += 1
+        if on_result is not None:
+            on_result(job, results)
+
+
+def _worker_process(location: str, wait: bool):
+    run_worker(open_queue(location), wait=wait)
+
+
+def run_workers(location: str, processes: int, wait: bool = False):
+    """Run several worker processes against one queue and wait for them"""
+    workers = [
+        multiprocessing.Process(target=_worker_process, args=(location, wait))
+        for _ in range(processes)
+    ]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
@@ -0,0 +1,177 @@
+"""Streaming reader for git's index file
+
+Reads entries one at a time straight from ``.git/index`` without building
+GitPython's IndexFile or touching any blob, so boolean questions such as
+"is anything unmerged?" can stop at the first matching entry.
+
+Supports index versions 2, 3 and 4. Extensions after the entries are not
+read.
+"""
+
+import struct
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+_HEADER = struct.Struct(">4sII")
+# ctime, mtime (seconds + nanoseconds each), dev, ino, mode, uid, gid, size
+_STAT_FIELDS = struct.Struct(">10I")
+_FLAGS = struct.Struct(">H")
+
+_EXTENDED_FLAG = 0x4000
+_STAGE_MASK = 0x3000
+_STAGE_SHIFT = 12
+_NAME_MASK = 0x0FFF
+
+CONFLICT_MARKERS = (b"<<<<<<<", b">>>>>>>")
+
+
+class IndexFormatError(ValueError):
+    """Raised when the index file is truncated or not a git index"""
+
+
+@dataclass(frozen=True, slots=True)
+class IndexEntry:
+    """One index entry: a path at a merge stage (0 when not conflicted)"""
+
+    path: str
+    stage: int
+    mode: int
+    sha: str
+
+
+@dataclass(frozen=True, slots=True)
+class ConflictEntry:
+    """An unmerged path and what is known about it without reading blobs"""
+
+    path: str
+    stages: tuple[int, ...]  # 1 = common ancestor, 2 = ours, 3 = theirs
+    has_markers: bool  # working file still contains <<<<<<< or >>>>>>> lines
+
+
+def _read_exact(stream: BinaryIO, size: int) -> bytes:
+    data = stream.read(size)
+    if len(data) != size:
+        raise IndexFormatError("Index file is truncated")
+    return data
+
+
+def _read_until_nul(stream: BinaryIO) -> bytes:
+    chunks = bytearray()
+    while (byte := _read_exact(stream, 1)) != b"\0":
+        chunks += byte
+    return bytes(chunks)
+
+
+def _read_offset(stream: BinaryIO) -> int:
+    """Read the variable-length integer used by index v4 path compression"""
+    byte = _read_exact(stream, 1)[0]
+    value = byte & 0x7F
+    while byte & 0x80:
+        value += 1
+        byte = _read_exact(stream, 1)[0]
+        value = (value << 7) + (byte & 0x7F)
+    return value
+
+
+def iter_entries(index_path: Path, hash_size: int = 20) -> Iterator[IndexEntry]:
+    """Yield index entries in order (sorted by path, then stage)
+
+    A missing index (fresh repository) yields nothing. The file is opened
+    once, so a concurrent git command replacing the index can't mix two
+    versions into one pass.
+    """
+    try:
+        stream = open(index_path, "rb")
+    except FileNotFoundError:
+        return
+
+    with stream:
+        signature, version, count = _HEADER.unpack(_read_exact(stream, _HEADER.size))
+        if signature != b"DIRC" or version not in (2, 3, 4):
+            raise IndexFormatError(f"Unsupported index: {signature!r} v{version}")
+
+        fixed_size = _STAT_FIELDS.size + hash_size + _FLAGS.size
+        previous_path = b""
+
+        for _ in range(count):
+            fixed = _read_exact(stream, fixed_size)
+            mode = _STAT_FIELDS.unpack_from(fixed)[6]
+            sha = fixed[_STAT_FIELDS.size : _STAT_FIELDS.size + hash_size].hex()
+            (flags,) = _FLAGS.unpack_from(fixed, fixed_size - _FLAGS.size)
+
+            entry_size = fixed_size
+            if version >= 3 and flags & _EXTENDED_FLAG:
+                _read_exact(stream, 2)
+                entry_size += 2
+
+            if version == 4:
+                strip = _read_offset(stream)
+                prefix = previous_path[: len(previous_path) - strip]
+                path = prefix + _read_until_nul(stream)
+            else:
+                name_length = flags & _NAME_MASK
+                if name_length < _NAME_MASK:
+                    path, terminator_read = _read_exact(stream, name_length), 0
+                else:
+                    path, terminator_read = _read_until_nul(stream), 1
+                entry_size += len(path)
+                # NUL terminator plus padding up to a multiple of eight
+                _read_exact(stream, 8 - entry_size % 8 - terminator_read)
+
+            previous_path = path
+            yield IndexEntry(
+                path=path.decode("utf-8", "surrogateescape"),
+                stage=(flags & _STAGE_MASK) >> _STAGE_SHIFT,
+                mode=mode,
+                sha=sha,
+            )
+
+
+def has_unmerged(index_path: Path, hash_size: int = 20) -> bool:
+    """Check for any entry at stage > 0, stopping at the first one found"""
+    return any(entry.stage for entry in iter_entries(index_path, hash_size))
+
+
+def has_conflict_markers(path: Path) -> bool:
+    """Scan a working file line by line for conflict markers"""
+    try:
+        with open(path, "rb") as f:
+            return any(line.startswith(CONFLICT_MARKERS) for line in f)
+    except (FileNotFoundError, IsADirectoryError):
+        return False
+
+
+def conflict_inventory(
+    index_path: Path, worktree: Path, hash_size: int = 20
+) -> list[ConflictEntry]:
+    """List every unmerged path in one pass over the index
+
+    Entries for a path are adjacent in the index, so stages are grouped as
+    they stream past. Only the working files of conflicted paths are read.
+    """
+    inventory = []
+    current_path: str | None = None
+    stages: list[int] = []
+
+    def flush():
+        if current_path is not None:
+            inventory.append(
+                ConflictEntry(
+                    path=current_path,
+                    stages=tuple(stages),
+                    has_markers=has_conflict_markers(worktree / current_path),
+                )
+            )
+
+    for entry in iter_entries(index_path, hash_size):
+        if not entry.stage:
+            continue
+        if entry.path != current_path:
+            flush()
+            current_path, stages = entry.path, []
+        stages.append(entry.stage)
+    flush()
+
+    return inventory
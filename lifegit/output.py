@@ -0,0 +1,91 @@
+"""Console factories for rich, compact and plain terminal output"""
+
+import copy
+import os
+import sys
+from enum import Enum
+
+from rich.console import Console, Group
+from rich.panel import Panel
+from rich.table import Table
+from rich.text import Text
+
+
+class OutputMode(str, Enum):
+    """How much decoration the terminal output carries"""
+
+    AUTO = "auto"  # rich on a terminal, plain when piped or in CI
+    RICH = "rich"  # colours, panels and banners
+    COMPACT = "compact"  # 16-colour ANSI, no boxes
+    PLAIN = "plain"  # no escape codes, no boxes
+
+
+class MinimalConsole(Console):
+    """Console that flattens panels into their title and body, tables into rows
+
+    Accepts the same ``print`` calls as a regular Console, so stages and
+    CLI commands don't need to know which renderer they are talking to.
+    """
+
+    def print(self, *objects, **kwargs):
+        super().print(*(_flatten(obj) for obj in objects), **kwargs)
+
+
+def _flatten(obj):
+    """Replace a Panel with its title and contents and draw a Table without
+    box characters; leave anything else alone"""
+    if isinstance(obj, Table):
+        rows = copy.copy(obj)
+        rows.box = None
+        rows.show_edge = False
+        rows.pad_edge = False
+        return rows
+    if not isinstance(obj, Panel):
+        return obj
+
+    parts = []
+    if obj.title:
+        title = obj.title
+        parts.append(Text.from_markup(title) if isinstance(title, str) else title)
+    parts.append(_flatten(obj.renderable))
+    return Group(*parts)
+
+
+def resolve_mode(mode: OutputMode) -> OutputMode:
+    """Turn AUTO into a concrete mode based on the environment"""
+    if mode is not OutputMode.AUTO:
+        return mode
+
+    env_mode = os.environ.get("LIFEGIT_OUTPUT", "").lower()
+    if env_mode in (m.value for m in OutputMode if m is not OutputMode.AUTO):
+        return OutputMode(env_mode)
+
+    if os.environ.get("CI") or not sys.stdout.isatty():
+        return OutputMode.PLAIN
+    return OutputMode.RICH
+
+
+def make_console(mode: OutputMode = OutputMode.AUTO, **kwargs) -> Console:
+    """Create a console for the given output mode"""
+    mode = resolve_mode(mode)
+
+    if mode is OutputMode.PLAIN:
+        return MinimalConsole(
+            color_system=None, highlight=False, emoji=False, **kwargs
+        )
+    if mode is OutputMode.COMPACT:
+        return MinimalConsole(
+            color_system="standard", highlight=False, emoji=False, **kwargs
+        )
+    return Console(**kwargs)
+
+
+def banner(console: Console, text: str):
+    """Print an act banner, boxed in rich mode and a single line otherwise"""
+    if isinstance(console, MinimalConsole):
+        console.print(f"\n[bold yellow]== {text} ==[/bold yellow]\n")
+        return
+
+    console.print(f"\n[bold yellow]{'═' * 40}[/bold yellow]")
+    console.print(f"[bold yellow]   {text}[/bold yellow]")
+    console.print(f"[bold yellow]{'═' * 40}[/bold yellow]\n")
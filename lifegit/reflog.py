@@ -0,0 +1,141 @@
+"""Lazy reader for git reflogs stored under .git/logs
+
+Entries are parsed one line at a time, newest first by reading the file
+backwards in blocks, so looking at recent history costs the same no matter
+how long the reflog has grown.
+"""
+
+import os
+from collections import defaultdict
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+BLOCK_SIZE = 8192
+
+
+@dataclass(frozen=True, slots=True)
+class ReflogEntry:
+    """One reflog line: a ref moving from old_sha to new_sha"""
+
+    old_sha: str
+    new_sha: str
+    name: str
+    email: str
+    timestamp: int
+    timezone: str
+    message: str
+
+    @property
+    def action(self) -> str:
+        """What moved the ref, e.g. "commit", "checkout", "rebase (start)" """
+        action, separator, _ = self.message.partition(": ")
+        return action if separator else self.message
+
+
+def parse_entry(line: bytes) -> ReflogEntry:
+    """Parse ``<old> <new> <name> <<email>> <time> <tz>\\t<message>``"""
+    text = line.decode("utf-8", "replace")
+    header, _, message = text.partition("\t")
+    old_sha, new_sha, identity = header.split(" ", 2)
+    person, _, when = identity.rpartition("> ")
+    name, _, email = person.partition(" <")
+    timestamp, _, timezone = when.partition(" ")
+    return ReflogEntry(
+        old_sha=old_sha,
+        new_sha=new_sha,
+        name=name,
+        email=email,
+        timestamp=int(timestamp),
+        timezone=timezone,
+        message=message,
+    )
+
+
+def _lines_backwards(stream: BinaryIO, block_size: int) -> Iterator[bytes]:
+    """Yield the non-empty lines of a file, last line first"""
+    stream.seek(0, os.SEEK_END)
+    position = stream.tell()
+    remainder = b""
+
+    while position > 0:
+        step = min(block_size, position)
+        position -= step
+        stream.seek(position)
+        lines = (stream.read(step) + remainder).split(b"\n")
+        remainder = lines.pop(0)  # may continue in the previous block
+        for line in reversed(lines):
+            if line:
+                yield line
+
+    if remainder:
+        yield remainder
+
+
+def iter_reflog(
+    log_path: Path, newest_first: bool = True, block_size: int = BLOCK_SIZE
+) -> Iterator[ReflogEntry]:
+    """Yield reflog entries lazily; a missing log yields nothing"""
+    try:
+        stream = open(log_path, "rb")
+    except FileNotFoundError:
+        return
+
+    with stream:
+        if newest_first:
+            lines = _lines_backwards(stream, block_size)
+        else:
+            lines = (line.rstrip(b"\n") for line in stream if line.strip())
+        for line in lines:
+            yield parse_entry(line)
+
+
+class ReflogIndex:
+    """Lookups by SHA and by action over one reflog
+
+    The index is built on the first lookup with a single pass over the
+    log; entries in each bucket are kept newest first.
+    """
+
+    def __init__(self, log_path: Path):
+        self.log_path = log_path
+        self._by_sha: dict[str, list[ReflogEntry]] | None = None
+        self._by_action: dict[str, list[ReflogEntry]] = {}
+
+    def _build(self):
+        by_sha = defaultdict(list)
+        by_action = defaultdict(list)
+        for entry in iter_reflog(self.log_path):
+            by_sha[entry.new_sha].append(entry)
+            by_action[entry.action].append(entry)
+        self._by_sha = dict(by_sha)
+        self._by_action = dict(by_action)
+
+    def by_sha(self, sha: str) -> list[ReflogEntry]:
+        """Entries that moved the ref to sha (a full SHA or unique prefix)"""
+        if self._by_sha is None:
+            self._build()
+        if sha in self._by_sha:
+            return self._by_sha[sha]
+        return [
+            entry
+            for full_sha, entries in self._by_sha.items()
+            if full_sha.startswith(sha)
+            for entry in entries
+        ]
+
+    def by_action(self, action: str) -> list[ReflogEntry]:
+        """Entries recorded by one action, e.g. "rebase (start)" """
+        if self._by_sha is None:
+            self._build()
+        return self._by_action.get(action, [])
+
+    def before(self, action: str) -> str | None:
+        """Commit the ref pointed at just before the latest given action
+
+        ``before("rebase (start)")`` is the commit a branch was on before
+        it was last rebased.
+        """
+        entries = self.by_action(action)
+        return entries[0].old_sha if entries else None
@@ -0,0 +1,230 @@
+"""Persistent store of grading results
+
+Every validation is appended to an SQLite database in WAL mode, grouped
+into runs (one grading pass over a cohort, or one ``validate --store``).
+A ``latest`` table keeps each repository's most recent outcome per act, so
+questions like "who hasn't passed Act 2" read one small index instead of
+scanning the full history.
+"""
+
+import sqlite3
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from .work_queue import JobResult
+
+DEFAULT_STORE = Path("results.db")
+# Values bound per IN (...) list, under SQLite's limit on bound parameters
+IN_CHUNK = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS repos (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    label TEXT,
+    started_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    repo_id INTEGER NOT NULL REFERENCES repos (id),
+    act INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    failing_check TEXT,
+    error TEXT,
+    duration_ms REAL NOT NULL,
+    head_sha TEXT,
+    graded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_by_run ON results (run_id, repo_id, act);
+CREATE INDEX IF NOT EXISTS results_by_repo ON results (repo_id, act, graded_at);
+CREATE TABLE IF NOT EXISTS latest (
+    repo_id INTEGER NOT NULL,
+    act INTEGER NOT NULL,
+    passed INTEGER NOT NULL,
+    run_id INTEGER NOT NULL,
+    PRIMARY KEY (repo_id, act)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS latest_by_outcome ON latest (act, passed, repo_id);
+"""
+
+
+def select_in(db: sqlite3.Connection, query: str, values: Iterable) -> Iterator[tuple]:
+    """Rows of a query whose ``IN ({})`` list is filled from values, in chunks"""
+    values = list(values)
+    for start in range(0, len(values), IN_CHUNK):
+        chunk = values[start : start + IN_CHUNK]
+        yield from db.execute(query.format(",".join("?" * len(chunk))), chunk)
+
+
+@dataclass(frozen=True, slots=True)
+class Regression:
+    """An act a repository passed in one run and failed in the next"""
+
+    repo: str
+    act: int
+    failing_check: str | None
+    head_sha: str | None
+
+
+class ResultStore:
+    """Indexed SQLite store of validation results"""
+
+    def __init__(self, path: Path = DEFAULT_STORE):
+        self.path = Path(path)
+        self._db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self) -> "ResultStore":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def record(
+        self, results: Iterable[JobResult], label: str | None = None
+    ) -> tuple[int, int]:
+        """Store results as a new run in one transaction; return (run id, how many)
+
+        The run row is written in the same transaction, so a failed record
+        leaves no empty run behind.
+        """
+        results = list(results)
+        now = time.time()
+
+        # IMMEDIATE: concurrent recorders get run ids in commit order
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            run_id = self._db.execute(
+                "INSERT INTO runs (label, started_at) VALUES (?, ?)", (label, now)
+            ).lastrowid
+            self._db.executemany(
+                "INSERT OR IGNORE INTO repos (path) VALUES (?)",
+                [(r.repo,) for r in results],
+            )
+            repo_ids = self._repo_ids({r.repo for r in results})
+            rows = [
+                (
+                    run_id,
+                    repo_ids[r.repo],
+                    r.act,
+                    r.passed,
+                    r.failing_check,
+                    r.error,
+                    r.duration_ms,
+                    r.head_sha,
+                    now,
+                )
+                for r in results
+            ]
+            self._db.executemany(
+                """
+                INSERT INTO results (run_id, repo_id, act, passed, failing_check,
+                                     error, duration_ms, head_sha, graded_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows,
+            )
+            # Never let an older run displace a newer run's outcome
+            self._db.executemany(
+                """
+                INSERT INTO latest VALUES (?, ?, ?, ?)
+                ON CONFLICT (repo_id, act) DO UPDATE
+                SET passed = excluded.passed, run_id = excluded.run_id
+                WHERE excluded.run_id >= latest.run_id
+                """,
+                [(row[1], row[2], row[3], run_id) for row in rows],
+            )
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+        return run_id, len(rows)
+
+    def _repo_ids(self, paths: set[str]) -> dict[str, int]:
+        rows = select_in(self._db, "SELECT id, path FROM repos WHERE path IN ({})", paths)
+        return {path: repo_id for repo_id, path in rows}
+
+    # Queries
+
+    def not_passed(self, act: int) -> list[str]:
+        """Repositories whose latest result for act is missing or failing"""
+        rows = self._db.execute(
+            """
+            SELECT path FROM repos
+            WHERE id NOT IN (SELECT repo_id FROM latest WHERE act = ? AND passed = 1)
+            ORDER BY path
+            """,
+            (act,),
+        )
+        return [path for (path,) in rows]
+
+    def last_runs(self, count: int = 2) -> list[int]:
+        """Ids of the most recent runs, newest first"""
+        rows = self._db.execute(
+            "SELECT id FROM runs ORDER BY id DESC LIMIT ?", (count,)
+        )
+        return [run_id for (run_id,) in rows]
+
+    def regressions(
+        self, run_id: int | None = None, previous_id: int | None = None
+    ) -> list[Regression]:
+        """Acts that fail in run_id but passed the time before
+
+        run_id defaults to the latest run. Without previous_id each result
+        is compared with that repository's own previous result for the act,
+        so runs that graded only part of the cohort don't hide anything.
+        """
+        if run_id is None:
+            runs = self.last_runs(1)
+            if not runs:
+                return []
+            run_id = runs[0]
+
+        if previous_id is not None:
+            previous = "prev.run_id = ?"
+            params = (previous_id, run_id)
+        else:
+            previous = """prev.id = (
+                SELECT id FROM results
+                WHERE repo_id = cur.repo_id AND act = cur.act AND run_id < cur.run_id
+                ORDER BY repo_id, act, graded_at DESC LIMIT 1
+            )"""
+            params = (run_id,)
+
+        rows = self._db.execute(
+            f"""
+            SELECT repos.path, cur.act, cur.failing_check, cur.head_sha
+            FROM results AS cur
+            JOIN results AS prev
+              ON {previous} AND prev.repo_id = cur.repo_id AND prev.act = cur.act
+            JOIN repos ON repos.id = cur.repo_id
+            WHERE cur.run_id = ? AND cur.passed = 0 AND prev.passed = 1
+            ORDER BY repos.path, cur.act
+            """,
+            params,
+        )
+        return [Regression(*row) for row in rows]
+
+    def history(self, repo: str) -> list[tuple[int, int, bool, str | None, float]]:
+        """(run, act, passed, failing_check, graded_at) for one repository"""
+        rows = self._db.execute(
+            """
+            SELECT run_id, act, passed, failing_check, graded_at
+            FROM results JOIN repos ON repos.id = results.repo_id
+            WHERE repos.path = ?
+            ORDER BY graded_at, act
+            """,
+            (repo,),
+        )
+        return [(run, act, bool(passed), check, at) for run, act, passed, check, at in rows]
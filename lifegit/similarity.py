@@ -0,0 +1,404 @@
+"""Near-duplicate detection for submitted decision files across cohorts
+
+Every ``decision.txt`` and ``*-life.txt`` at a branch tip is reduced to a
+MinHash signature of its character shingles, and the signature is cut
+into bands. Two files sharing any band land in the same bucket of an
+SQLite index, so finding a file's likely copies is a handful of indexed
+lookups instead of a comparison with every other file. Candidates are then
+scored by how many signature values they share, which estimates the
+Jaccard similarity of their shingle sets.
+
+Indexing is incremental: each file's blob SHA is stored, and a repository
+whose files haven't changed since the last pass costs one ``for-each-ref``
+and one ``ls-tree`` per branch, with no blob read.
+
+Files too short to tell copying from coincidence are not indexed, and
+neither are files matching a registered template (a starter text handed
+out to the whole cohort), since every unedited copy would match every
+other one.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from .grading import find_repos
+from .results import select_in
+
+DEFAULT_INDEX = Path("similarity.db")
+DEFAULT_THRESHOLD = 0.8
+
+NUM_PERM = 128
+BANDS = 16
+ROWS = NUM_PERM // BANDS  # files above ~0.71 similarity, (1/BANDS)**(1/ROWS), share a bucket
+SHINGLE_SIZE = 5
+MIN_SHINGLES = 25  # roughly 30 characters; shorter files are left out
+TEMPLATE_THRESHOLD = 0.9  # files this close to a template count as unedited
+MAX_BUCKET_DOCS = 500  # bigger buckets hold shared boilerplate, not copies
+MAX_FILE_BYTES = 64 * 1024  # longer files are indexed by their start only
+LIFE_SUFFIX = "-life.txt"
+
+# One keyed BLAKE2b per 16 signature values: 64 bytes of digest per shingle
+_HASHERS = [
+    hashlib.blake2b(key=b"lifegit-minhash", salt=block.to_bytes(16))
+    for block in range(NUM_PERM // 16)
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    repo TEXT NOT NULL,
+    path TEXT NOT NULL,
+    blob TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    UNIQUE (repo, path)
+);
+CREATE TABLE IF NOT EXISTS bands (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    doc_id INTEGER NOT NULL,
+    PRIMARY KEY (band, bucket, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS bands_by_doc ON bands (doc_id);
+CREATE TABLE IF NOT EXISTS templates (
+    signature BLOB PRIMARY KEY
+);
+"""
+
+
+@dataclass(frozen=True, slots=True)
+class Document:
+    """One decision file as read from a branch tip"""
+
+    repo: str
+    path: str
+    blob: str
+    signature: bytes | None  # None when the blob is already indexed
+
+
+@dataclass(frozen=True, slots=True)
+class Hit:
+    """An indexed file similar to a queried text"""
+
+    repo: str
+    path: str
+    similarity: float
+
+
+@dataclass(frozen=True, slots=True)
+class Match:
+    """Two files whose estimated similarity meets the threshold"""
+
+    repo: str
+    path: str
+    other_repo: str
+    other_path: str
+    similarity: float
+
+
+def is_decision_file(path: str) -> bool:
+    """Whether a path is one of the files Act 1 and Act 2 ask students to write"""
+    from .content import store
+
+    name = path.rsplit("/", 1)[-1]
+    return name == store.current().act1.prompts.file_name or name.endswith(LIFE_SUFFIX)
+
+
+def _shingles(text: str) -> set[bytes]:
+    """The text's character shingles, ignoring case and spacing"""
+    text = re.sub(r"\s+", " ", text.lower()).strip()
+    return {text[i : i + SHINGLE_SIZE].encode() for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def signature(text: str) -> bytes | None:
+    """MinHash signature of a text: NUM_PERM 32-bit minimums, None if too short
+
+    Each signature value is the minimum of one independent hash function
+    over the shingles. The functions are slices of keyed BLAKE2b digests,
+    so the per-shingle work happens in C and each minimum is taken over a
+    strided slice of one array.
+    """
+    shingles = _shingles(text)
+    if len(shingles) < MIN_SHINGLES:
+        return None
+    digests = bytearray()
+    for shingle in shingles:
+        for hasher in _HASHERS:
+            h = hasher.copy()
+            h.update(shingle)
+            digests += h.digest()
+    values = array("I", digests)
+    if sys.byteorder == "big":
+        values.byteswap()
+    minimums = array("I", (min(values[i::NUM_PERM]) for i in range(NUM_PERM)))
+    if sys.byteorder == "big":
+        minimums.byteswap()
+    return minimums.tobytes()
+
+
+def similarity(first: bytes, second: bytes) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    a, b = array("I", first), array("I", second)
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def _buckets(sig: bytes) -> list[tuple[int, int]]:
+    """(band, bucket) for each band of a signature"""
+    width = ROWS * 4
+    buckets = []
+    for band in range(BANDS):
+        rows = sig[band * width : (band + 1) * width]
+        digest = hashlib.blake2b(rows, digest_size=8).digest()
+        buckets.append((band, int.from_bytes(digest, signed=True)))
+    return buckets
+
+
+def extract_documents(location: str, known: dict[str, str]) -> list[Document]:
+    """Decision files at every branch tip of one repository or bundle
+
+    Paths are reported as ``branch:path``. A blob already seen on another
+    branch is skipped, so a file carried unchanged into a what-if branch
+    counts once. Files too short to sign are left out. known maps paths
+    to the blob SHAs already indexed; those blobs are not read again.
+    """
+    from .git_wrapper import LifeRepo
+
+    repo = LifeRepo.open(Path(location))
+    documents = []
+    seen = set()
+    with repo:
+        if not repo.is_git_repo() or not repo.is_initialized():
+            return []
+        git = repo.repo.git
+        for branch in repo.list_branches():
+            for entry in git.ls_tree("-r", "-z", branch).split("\0"):
+                info, _, file_path = entry.partition("\t")
+                if not is_decision_file(file_path):
+                    continue
+                _mode, kind, blob = info.split()
+                if kind != "blob" or blob in seen:
+                    continue
+                seen.add(blob)
+                key = f"{branch}:{file_path}"
+                if known.get(key) == blob:
+                    documents.append(Document(location, key, blob, None))
+                    continue
+                stream = repo.repo.odb.stream(bytes.fromhex(blob))
+                text = stream.read(MAX_FILE_BYTES).decode(errors="replace")
+                if (sig := signature(text)) is not None:
+                    documents.append(Document(location, key, blob, sig))
+    return documents
+
+
+def _extract(job: tuple[str, dict[str, str]]) -> tuple[str, list[Document] | None]:
+    location, known = job
+    try:
+        return location, extract_documents(location, known)
+    except Exception:  # one broken repo must not stop the pass
+        return location, None
+
+
+class SimilarityIndex:
+    """On-disk MinHash/LSH index of decision files"""
+
+    def __init__(self, path: Path = DEFAULT_INDEX):
+        self.path = Path(path)
+        self._db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        rows = self._db.execute("SELECT signature FROM templates")
+        self._templates = [sig for (sig,) in rows]
+
+    def close(self):
+        self._db.close()
+
+    def __enter__(self) -> "SimilarityIndex":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT count(*) FROM docs").fetchone()[0]
+
+    def add_template(self, text: str) -> int:
+        """Register a starter text and drop indexed files matching it; return how many
+
+        Later passes skip matching files too. Raises ValueError if the text
+        is too short to sign.
+        """
+        sig = signature(text)
+        if sig is None:
+            raise ValueError("Template is too short to compare files against")
+        stale = [
+            doc_id
+            for doc_id, (_, _, other) in self._docs(self.candidates(sig)).items()
+            if similarity(sig, other) >= TEMPLATE_THRESHOLD
+        ]
+
+        self._db.execute("BEGIN")
+        try:
+            self._db.execute("INSERT OR IGNORE INTO templates VALUES (?)", (sig,))
+            for doc_id in stale:
+                self._db.execute("DELETE FROM bands WHERE doc_id = ?", (doc_id,))
+                self._db.execute("DELETE FROM docs WHERE id = ?", (doc_id,))
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+        if sig not in self._templates:
+            self._templates.append(sig)
+        return len(stale)
+
+    def is_template(self, sig: bytes) -> bool:
+        """Whether a signature matches a registered template"""
+        return any(similarity(sig, t) >= TEMPLATE_THRESHOLD for t in self._templates)
+
+    def known_blobs(self, repo: str) -> dict[str, str]:
+        """Indexed paths of one repository and their blob SHAs"""
+        rows = self._db.execute("SELECT path, blob FROM docs WHERE repo = ?", (repo,))
+        return dict(rows)
+
+    def update_repo(self, repo: str, documents: Iterable[Document]) -> int:
+        """Make the index match a repository's current files; return how many changed
+
+        Files whose signature is None are unchanged and kept; indexed files
+        no longer present, or now matching a template, are dropped.
+        """
+        documents = [
+            d for d in documents if d.signature is None or not self.is_template(d.signature)
+        ]
+        present = {d.path for d in documents}
+        changed = [d for d in documents if d.signature is not None]
+        replaced = {d.path for d in changed}
+
+        self._db.execute("BEGIN")
+        try:
+            indexed = self._db.execute(
+                "SELECT id, path FROM docs WHERE repo = ?", (repo,)
+            ).fetchall()
+            removed = [path for _, path in indexed if path not in present]
+            stale = [
+                doc_id for doc_id, path in indexed if path not in present or path in replaced
+            ]
+            for doc_id in stale:
+                self._db.execute("DELETE FROM bands WHERE doc_id = ?", (doc_id,))
+                self._db.execute("DELETE FROM docs WHERE id = ?", (doc_id,))
+            for doc in changed:
+                cursor = self._db.execute(
+                    "INSERT INTO docs (repo, path, blob, signature) VALUES (?, ?, ?, ?)",
+                    (repo, doc.path, doc.blob, doc.signature),
+                )
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO bands VALUES (?, ?, ?)",
+                    [(band, bucket, cursor.lastrowid) for band, bucket in _buckets(doc.signature)],
+                )
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+        return len(changed) + len(removed)
+
+    def index_cohort(self, cohort: Path, processes: int | None = None) -> tuple[int, int, int]:
+        """Bring every repository of a cohort up to date in the index
+
+        Returns (repositories indexed, files (re)hashed, repositories that failed).
+        """
+        jobs = [
+            (location, self.known_blobs(location))
+            for location in (str(path.resolve()) for path in find_repos(cohort))
+        ]
+        processes = processes or os.cpu_count() or 1
+
+        if processes > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(processes) as pool:
+                chunksize = max(1, len(jobs) // (processes * 8))
+                return self._apply(pool.map(_extract, jobs, chunksize=chunksize))
+        return self._apply(map(_extract, jobs))
+
+    def _apply(
+        self, extracted: Iterator[tuple[str, list[Document] | None]]
+    ) -> tuple[int, int, int]:
+        indexed = hashed = failed = 0
+        for location, documents in extracted:
+            if documents is None:
+                failed += 1
+                continue
+            self.update_repo(location, documents)
+            indexed += 1
+            hashed += sum(1 for d in documents if d.signature is not None)
+        return indexed, hashed, failed
+
+    def candidates(self, sig: bytes) -> set[int]:
+        """Ids of documents sharing at least one band with a signature"""
+        found = set()
+        for band, bucket in _buckets(sig):
+            rows = self._db.execute(
+                "SELECT doc_id FROM bands WHERE band = ? AND bucket = ?", (band, bucket)
+            )
+            found.update(doc_id for (doc_id,) in rows)
+        return found
+
+    def _docs(self, ids: Iterable[int]) -> dict[int, tuple[str, str, bytes]]:
+        rows = select_in(
+            self._db, "SELECT id, repo, path, signature FROM docs WHERE id IN ({})", ids
+        )
+        return {doc_id: (repo, path, sig) for doc_id, repo, path, sig in rows}
+
+    def query(self, text: str, threshold: float = DEFAULT_THRESHOLD) -> list[Hit]:
+        """Indexed files similar to text, most similar first"""
+        sig = signature(text)
+        if sig is None:
+            return []
+        hits = [
+            Hit(repo, path, score)
+            for repo, path, other in self._docs(self.candidates(sig)).values()
+            if (score := similarity(sig, other)) >= threshold
+        ]
+        return sorted(hits, key=lambda h: -h.similarity)
+
+    def duplicates(self, threshold: float = DEFAULT_THRESHOLD) -> list[Match]:
+        """Pairs of files from different repositories at or above threshold
+
+        Only documents sharing a bucket are compared, so the work grows
+        with the number of near-duplicates, not with the cohort squared.
+        Each document is compared with the later documents in its buckets,
+        one document at a time, so no set of every pair is built. Buckets
+        holding more than MAX_BUCKET_DOCS files are skipped: that many
+        students sharing text is boilerplate, not copying.
+        """
+        crowded = set(
+            self._db.execute(
+                "SELECT band, bucket FROM bands GROUP BY band, bucket HAVING count(*) > ?",
+                (MAX_BUCKET_DOCS,),
+            )
+        )
+        matches = []
+        for doc_id, repo, path, sig in self._db.execute(
+            "SELECT id, repo, path, signature FROM docs ORDER BY id"
+        ):
+            later = set()
+            for band, bucket in _buckets(sig):
+                if (band, bucket) in crowded:
+                    continue
+                rows = self._db.execute(
+                    "SELECT doc_id FROM bands WHERE band = ? AND bucket = ? AND doc_id > ?",
+                    (band, bucket, doc_id),
+                )
+                later.update(other_id for (other_id,) in rows)
+
+            for other_repo, other_path, other_sig in self._docs(later).values():
+                if other_repo == repo:
+                    continue
+                score = similarity(sig, other_sig)
+                if score >= threshold:
+                    matches.append(Match(repo, path, other_repo, other_path, score))
+        return sorted(matches, key=lambda m: (-m.similarity, m.repo, m.other_repo))
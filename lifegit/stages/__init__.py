@@ -1,6 +1,14 @@
 """Tutorial stages (acts)"""
 
-from .act1 import Act1
-from .act2 import Act2
+from .registry import ActSpec, available_acts, get_act
 
-__all__ = ["Act1", "Act2"]
+__all__ = ["Act1", "Act2", "ActSpec", "available_acts", "get_act"]
+
+
+def __getattr__(name: str):
+    # Stage classes are imported lazily so commands only pay for the acts they use
+    if name.startswith("Act") and name[3:].isdigit():
+        spec = get_act(int(name[3:]))
+        if spec is not None:
+            return spec.load()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
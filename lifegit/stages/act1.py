@@ -3,7 +3,6 @@
 from rich.panel import Panel
 from rich.text import Text
 
-from ..content import content
 from ..validator import StageValidator
 from .base import BaseStage, MenuOption
 
@@ -19,7 +18,7 @@ class Act1(BaseStage):
         self.console.print()
         self.console.print(
             Panel(
-                Text(content.act1.narrative.introduction),
+                Text(self.content.act1.narrative.introduction),
                 title="[bold]Act 1: The First Decision[/bold]",
                 subtitle="[dim]Age 18 — Leaving Home[/dim]",
                 border_style="cyan",
@@ -29,7 +28,7 @@ class Act1(BaseStage):
 
     def run_exercise(self):
         """Run the interactive exercise"""
-        filename = content.act1.prompts.file_name
+        filename = self.content.act1.prompts.file_name
 
         if self.advanced:
             self._run_advanced(filename)
@@ -142,7 +141,7 @@ class Act1(BaseStage):
 
         self.console.print(
             Panel(
-                content.act1.prompts.instructions,
+                self.content.act1.prompts.instructions,
                 title="[bold yellow]Your Task[/bold yellow]",
                 border_style="yellow",
                 padding=(1, 2),
@@ -169,14 +168,16 @@ class Act1(BaseStage):
         if not self.repo.is_initialized():
             self.console.print("[dim]No commits yet[/dim]")
 
-        if self.repo.untracked_files:
+        status = self.repo.status()
+
+        if status.untracked:
             self.console.print("[red]Untracked files:[/red]")
-            for f in self.repo.untracked_files:
+            for f in status.untracked:
                 self.console.print(f"  [red]{f}[/red]")
 
-        if self.repo.staged_files:
+        if status.staged:
             self.console.print("[green]Changes to be committed:[/green]")
-            for f in self.repo.staged_files:
+            for f in status.staged:
                 self.console.print(f"  [green]{f}[/green]")
 
     def _show_hint(self, filename: str):
@@ -191,12 +192,14 @@ class Act1(BaseStage):
             self.console.print(f"  [dim]echo 'My decision: ...' > {filename}[/dim]")
             return
 
-        if self.repo.has_untracked_files():
+        status = self.repo.status()
+
+        if status.untracked:
             self.console.print("\n[cyan]Hint:[/cyan] Your file exists but isn't staged yet")
             self.console.print(f"  [dim]git add {filename}[/dim]")
             return
 
-        if self.repo.has_uncommitted_changes():
+        if status.is_dirty:
             self.console.print("\n[cyan]Hint:[/cyan] Your file is staged. Now commit it!")
             self.console.print("  [dim]git commit -m 'My first decision'[/dim]")
             return
@@ -205,24 +208,25 @@ class Act1(BaseStage):
 
     def validate(self) -> bool:
         """Check if the exercise is complete"""
+        self.failed_check = None
+
         # Must have a git repository
         if not self.repo.is_git_repo():
-            return False
+            return self._failed("git-repository")
 
-        filename = content.act1.prompts.file_name
+        filename = self.content.act1.prompts.file_name
 
         # Must have the file
-        if not StageValidator.file_exists(filename, self.repo.path):
-            return False
+        if not StageValidator.file_present(self.repo, filename):
+            return self._failed("file-exists")
 
         # Must have at least one commit (more than initial state)
-        initial_commits = self.initial_state.get("commits", 0) or 0
-        if self.repo.count_commits() <= initial_commits:
-            return False
+        if not self._has_new_commits():
+            return self._failed("new-commit")
 
         # File should be in the latest commit
         if not self.repo.file_in_last_commit(filename):
-            return False
+            return self._failed("file-committed")
 
         return True
 
@@ -231,7 +235,7 @@ class Act1(BaseStage):
         self.console.print()
         self.console.print(
             Panel(
-                Text(content.act1.narrative.conclusion),
+                Text(self.content.act1.narrative.conclusion),
                 title="[bold green]Decision Made[/bold green]",
                 border_style="green",
                 padding=(1, 2),
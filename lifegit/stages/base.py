@@ -3,14 +3,17 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 
+from git.exc import GitCommandError
 from rich.console import Console
 from rich.panel import Panel
 from rich.prompt import Prompt
 
-from ..git_wrapper import LifeRepo
+from ..checkpoints import CheckpointError
+from ..content import Content, store
+from ..git_wrapper import LifeRepo, RepoLockedError
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MenuOption:
     """A single menu option"""
 
@@ -20,6 +23,26 @@ class MenuOption:
     action: str  # internal action identifier
 
 
+@dataclass(frozen=True, slots=True)
+class StageState:
+    """Repo state captured at stage start for validation comparison"""
+
+    commits: int = 0
+    branches: tuple[str, ...] = ()
+    current_branch: str | None = None
+
+
+def capture_state(repo: LifeRepo) -> StageState:
+    """Snapshot the repo state a stage's validation is compared against"""
+    if not repo.is_git_repo():
+        return StageState()
+    return StageState(
+        commits=repo.count_commits(),
+        branches=tuple(repo.list_branches()),
+        current_branch=repo.current_branch() if repo.is_initialized() else None,
+    )
+
+
 class BaseStage(ABC):
     """Abstract base class for tutorial acts"""
 
@@ -27,27 +50,60 @@ class BaseStage(ABC):
     act_number: int = 0
     title: str = ""
 
-    def __init__(self, repo: LifeRepo, console: Console, advanced: bool = False):
+    # Name of the check that made the last validate() fail, None if it passed
+    failed_check: str | None = None
+
+    def __init__(
+        self,
+        repo: LifeRepo,
+        console: Console,
+        advanced: bool = False,
+        initial_state: StageState | None = None,
+    ):
         self.repo = repo
         self.console = console
         self.advanced = advanced
-        self.initial_state = self._capture_state()
-
-    def _capture_state(self) -> dict:
+        # Pinned until the next step boundary, so one step never mixes versions
+        self.content: Content = store.current()
+        # Pass StageState() to grade a finished repo against an empty start
+        self.initial_state = (
+            initial_state if initial_state is not None else self._capture_state()
+        )
+
+    def _capture_state(self) -> StageState:
         """Capture repo state at stage start for validation comparison"""
-        if not self.repo.is_git_repo():
-            return {
-                "commits": 0,
-                "branches": [],
-                "current_branch": None,
-            }
-        return {
-            "commits": self.repo.count_commits(),
-            "branches": self.repo.list_branches(),
-            "current_branch": self.repo.current_branch()
-            if self.repo.is_initialized()
-            else None,
-        }
+        return capture_state(self.repo)
+
+    def _has_new_commits(self) -> bool:
+        """Check for commits beyond the starting state, walking no further"""
+        baseline = self.initial_state.commits
+        return self.repo.count_commits(limit=baseline + 1) > baseline
+
+    def _failed(self, check: str) -> bool:
+        """Record which check failed; validate() returns the result directly"""
+        self.failed_check = check
+        return False
+
+    def next_step(self, label: str):
+        """Mark a step boundary: checkpoint the repo, maintain it if due and
+        pick up edited content"""
+        self.checkpoint(label)
+        if self.repo.is_git_repo():
+            self.repo.maintain_if_due()
+        self.content = store.current()
+
+    def checkpoint(self, label: str):
+        """Record the repo at a step boundary so `lifegit rollback` can return to it
+
+        Best effort: a missing repo, a conflicted index or a busy lock just
+        means this step has no checkpoint.
+        """
+        if not self.repo.is_git_repo() or self.repo.is_bare():
+            return
+        try:
+            self.repo.checkpoint(f"act {self.act_number}: {label}")
+        except (CheckpointError, GitCommandError, RepoLockedError):
+            pass
 
     # Menu system for simple mode
 
@@ -65,7 +121,9 @@ class BaseStage(ABC):
 
         self.console.print()
         valid_keys = [opt.key for opt in options]
-        choice = Prompt.ask("Choose", choices=valid_keys, show_choices=False)
+        choice = Prompt.ask(
+            "Choose", choices=valid_keys, show_choices=False, console=self.console
+        )
 
         # Find and return the action
         for opt in options:
@@ -75,12 +133,13 @@ class BaseStage(ABC):
         return options[0].action  # fallback
 
     def show_command_result(self, command: str, success: bool, message: str = ""):
-        """Show the result of executing a git command"""
+        """Show the result of executing a git command (a step boundary on success)"""
         self.console.print()
         if success:
             self.console.print(f"[green]$ {command}[/green]")
             if message:
                 self.console.print(f"[dim]{message}[/dim]")
+            self.next_step(command)
         else:
             self.console.print(f"[red]$ {command}[/red]")
             if message:
@@ -104,8 +163,8 @@ class BaseStage(ABC):
         """Ask student for text input (e.g., commit message, branch name)"""
         self.console.print()
         if default:
-            return Prompt.ask(prompt, default=default)
-        return Prompt.ask(prompt)
+            return Prompt.ask(prompt, default=default, console=self.console)
+        return Prompt.ask(prompt, console=self.console)
 
     # Abstract methods for subclasses
 
@@ -131,6 +190,7 @@ class BaseStage(ABC):
 
     def run(self):
         """Main execution flow for a stage"""
+        self.next_step("start")
         self.introduction()
         self.run_exercise()
 
@@ -142,4 +202,5 @@ class BaseStage(ABC):
             while not self.validate():
                 input("Press Enter to check again...")
 
+        self.next_step("complete")
         self.conclusion()
@@ -0,0 +1,60 @@
+"""Prepare the next act in the background while the current one wraps up
+
+While a conclusion is on screen and the student decides whether to go on,
+a worker thread imports the next act's module, touches its content and
+captures the repo snapshot its validation will compare against. If the
+repo changes before the student continues, the snapshot is thrown away
+and the next act captures a fresh one as usual.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+
+from ..content import store
+from ..git_wrapper import LifeRepo
+from .base import BaseStage, StageState, capture_state
+from .registry import ActSpec
+
+
+@dataclass(frozen=True, slots=True)
+class PreparedAct:
+    """The next act's class and the repo snapshot taken for it"""
+
+    stage_class: type[BaseStage]
+    initial_state: StageState
+    fingerprint: tuple | None
+
+
+class ActPrefetcher:
+    """Load one act and snapshot the repo for it on a worker thread"""
+
+    def __init__(self, repo: LifeRepo, spec: ActSpec):
+        self.repo = repo
+        self.spec = spec
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        self._future: Future[PreparedAct] = self._executor.submit(self._prepare)
+        self._executor.shutdown(wait=False)
+
+    def _prepare(self) -> PreparedAct:
+        # Stamp first: a change during the capture must invalidate it
+        fingerprint = self.repo.fingerprint()
+        stage_class = self.spec.load()
+        # Picks up an edited content.toml off the prompt thread
+        getattr(store.current(), f"act{self.spec.number}", None)
+        return PreparedAct(stage_class, capture_state(self.repo), fingerprint)
+
+    def result(self) -> tuple[type[BaseStage], StageState | None]:
+        """The act's class, and its snapshot if the repo is still unchanged
+
+        A None snapshot tells the stage to capture its own. Errors in the
+        background are not raised here; loading again in the foreground
+        reports them normally.
+        """
+        try:
+            prepared = self._future.result()
+        except Exception:
+            return self.spec.load(), None
+
+        if self.repo.fingerprint() != prepared.fingerprint:
+            return prepared.stage_class, None
+        return prepared.stage_class, prepared.initial_state
@@ -0,0 +1,58 @@
+"""Registry of tutorial acts, imported only when they run or are validated"""
+
+from dataclasses import dataclass
+from functools import cache
+from importlib import import_module
+from importlib.metadata import entry_points
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .base import BaseStage
+
+ENTRY_POINT_GROUP = "lifegit.acts"
+
+
+@dataclass(frozen=True)
+class ActSpec:
+    """Metadata for an act; the stage class itself is loaded on demand"""
+
+    number: int
+    target: str  # e.g., "lifegit.stages.act1:Act1"
+
+    def load(self) -> type["BaseStage"]:
+        """Import the module declaring this act and return its stage class"""
+        module_name, _, class_name = self.target.partition(":")
+        return getattr(import_module(module_name), class_name)
+
+
+# Built-in acts, also declared as entry points in pyproject.toml. Kept here
+# so a source checkout that was never installed still finds them.
+_BUILTIN_ACTS = (
+    ActSpec(1, "lifegit.stages.act1:Act1"),
+    ActSpec(2, "lifegit.stages.act2:Act2"),
+)
+
+
+@cache
+def _discover() -> dict[int, ActSpec]:
+    """Collect built-in acts and those registered by installed plugins"""
+    specs = {spec.number: spec for spec in _BUILTIN_ACTS}
+
+    for ep in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            number = int(ep.name)
+        except ValueError:
+            continue  # entry point names must be act numbers
+        specs[number] = ActSpec(number, ep.value)
+
+    return dict(sorted(specs.items()))
+
+
+def available_acts() -> list[ActSpec]:
+    """All known acts in play order"""
+    return list(_discover().values())
+
+
+def get_act(number: int) -> ActSpec | None:
+    """Look up a single act by number without importing any stage module"""
+    return _discover().get(number)
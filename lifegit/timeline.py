@@ -0,0 +1,121 @@
+"""Life timeline: the commit graph as a lazily rendered stream of rows
+
+Commits are streamed from ``git rev-list`` in topological order and laid
+out one at a time. Only the lanes that are currently open are remembered
+(one per branch line still waiting for its next commit), so memory stays
+proportional to the graph's width, not its length, and a page of rows
+costs the same whether the history has fifty commits or five million.
+"""
+
+import itertools
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from git import Commit
+
+    from .git_wrapper import LifeRepo
+
+COMMIT = "*"
+LANE = "|"
+JOIN = "/"  # a lane that ends here: its branch continues from this commit
+FORK = "\\"  # a lane opened here for a merge's second parent
+
+
+@dataclass(frozen=True, slots=True)
+class TimelineRow:
+    """One commit with the graph cells drawn to its left"""
+
+    graph: str
+    sha: str
+    date: str
+    subject: str
+    refs: tuple[str, ...] = ()
+
+
+class LaneTracker:
+    """Assign commits to graph columns incrementally
+
+    Each lane holds the SHA of the commit it expects next. Placing a commit
+    consumes every lane waiting for it and reopens lanes for its parents.
+    """
+
+    def __init__(self):
+        self.lanes: list[str | None] = []
+
+    def _free_lane(self, skip: int = -1) -> int:
+        for i, expected in enumerate(self.lanes):
+            if expected is None and i != skip:
+                return i
+        self.lanes.append(None)
+        return len(self.lanes) - 1
+
+    def place(self, sha: str, parents: tuple[str, ...]) -> str:
+        """Lay out one commit and return its graph cells"""
+        waiting = [i for i, expected in enumerate(self.lanes) if expected == sha]
+        column = waiting[0] if waiting else self._free_lane()
+        joined = set(waiting[1:])
+
+        self.lanes[column] = parents[0] if parents else None
+        for i in joined:
+            self.lanes[i] = None
+
+        forked = set()
+        for parent in parents[1:]:
+            if parent not in self.lanes:
+                lane = self._free_lane(skip=column)
+                self.lanes[lane] = parent
+                forked.add(lane)
+
+        cells = []
+        for i, expected in enumerate(self.lanes):
+            if i == column:
+                cells.append(COMMIT)
+            elif i in joined:
+                cells.append(JOIN)
+            elif i in forked:
+                cells.append(FORK)
+            else:
+                cells.append(LANE if expected is not None else " ")
+
+        while self.lanes and self.lanes[-1] is None:
+            self.lanes.pop()
+        return " ".join(cells).rstrip()
+
+
+def iter_timeline(
+    commits: Iterable["Commit"], refs: dict[str, tuple[str, ...]] | None = None
+) -> Iterator[TimelineRow]:
+    """Turn commits (newest first, topologically ordered) into rows"""
+    tracker = LaneTracker()
+    refs = refs or {}
+    for commit in commits:
+        sha = commit.hexsha
+        yield TimelineRow(
+            graph=tracker.place(sha, tuple(parent.hexsha for parent in commit.parents)),
+            sha=sha[:7],
+            date=datetime.fromtimestamp(commit.committed_date).strftime("%Y-%m-%d"),
+            subject=str(commit.summary),
+            refs=refs.get(sha, ()),
+        )
+
+
+def repo_timeline(repo: "LifeRepo", all_branches: bool = True) -> Iterator[TimelineRow]:
+    """Stream the timeline of HEAD, or of every branch, from a repository"""
+    if not repo.is_initialized():
+        return iter(())
+
+    refs: dict[str, tuple[str, ...]] = {}
+    for head in repo.repo.heads:
+        refs[head.commit.hexsha] = (*refs.get(head.commit.hexsha, ()), head.name)
+
+    commits = repo.repo.iter_commits("HEAD", branches=all_branches, topo_order=True)
+    return iter_timeline(commits, refs)
+
+
+def page(rows: Iterator[TimelineRow], size: int) -> Iterator[list[TimelineRow]]:
+    """Split a row stream into pages, reading only one page ahead"""
+    while chunk := list(itertools.islice(rows, size)):
+        yield chunk
@@ -1,9 +1,84 @@
-"""Validation helpers for tutorial exercises"""
+"""Validation helpers for tutorial exercises
 
+Each check is written once, as a generator that yields the repository
+calls it needs as ``(method name, *args)`` and is sent each result back.
+StageValidator answers those calls on a LifeRepo directly and
+AsyncStageValidator awaits them on an AsyncLifeRepo, so the two can't
+drift apart.
+"""
+
+from collections.abc import Generator
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 from .git_wrapper import LifeRepo
 
+if TYPE_CHECKING:
+    from .async_repo import AsyncLifeRepo
+
+type Check = Generator[tuple, Any, bool]
+
+
+def _file_present(filename: str) -> Check:
+    return (yield "file_exists", filename)
+
+
+def _file_exists_and_committed(filename: str) -> Check:
+    if not (yield "file_exists", filename):
+        return False
+    return (yield "file_in_last_commit", filename)
+
+
+def _branch_exists(branch_name: str) -> Check:
+    return (yield "has_branch", branch_name)
+
+
+def _on_branch(branch_name: str) -> Check:
+    return (yield "current_branch",) == branch_name
+
+
+def _has_commits(minimum: int) -> Check:
+    return (yield "count_commits", None, minimum) >= minimum
+
+
+def _branches_merged(source: str, target: str) -> Check:
+    if not (yield "has_branch", source) or not (yield "has_branch", target):
+        return False
+    # Check if source's tip commit is in target's history
+    return (yield "is_ancestor", source, target)
+
+
+def _conflict_resolved() -> Check:
+    # The index scan stops at the first conflict, so the working-tree
+    # status only runs once nothing is unmerged
+    return not (yield "has_conflicts",) and not (yield "has_uncommitted_changes",)
+
+
+def _conflict_markers_removed() -> Check:
+    return not any(entry.has_markers for entry in (yield "conflicts",))
+
+
+def _run(repo: LifeRepo, check: Check) -> bool:
+    """Drive a check against a LifeRepo"""
+    try:
+        call = next(check)
+        while True:
+            method, *args = call
+            call = check.send(getattr(repo, method)(*args))
+    except StopIteration as done:
+        return done.value
+
+
+async def _run_async(repo: "AsyncLifeRepo", check: Check) -> bool:
+    """Drive a check against an AsyncLifeRepo"""
+    try:
+        call = next(check)
+        while True:
+            method, *args = call
+            call = check.send(await getattr(repo, method)(*args))
+    except StopIteration as done:
+        return done.value
+
 
 class StageValidator:
     """Reusable validation logic for exercises"""
@@ -13,42 +88,86 @@ class StageValidator:
         """Check if file exists in working directory"""
         return (repo_path / filename).exists()
 
+    @staticmethod
+    def file_present(repo: LifeRepo, filename: str) -> bool:
+        """Check if file exists in the repo's working tree (or tip tree if bare)"""
+        return _run(repo, _file_present(filename))
+
     @staticmethod
     def file_exists_and_committed(repo: LifeRepo, filename: str) -> bool:
         """Check if file exists and was included in the last commit"""
-        if not StageValidator.file_exists(filename, repo.path):
-            return False
-        return repo.file_in_last_commit(filename)
+        return _run(repo, _file_exists_and_committed(filename))
 
     @staticmethod
     def branch_exists(repo: LifeRepo, branch_name: str) -> bool:
         """Check if a branch exists"""
-        return branch_name in repo.list_branches()
+        return _run(repo, _branch_exists(branch_name))
 
     @staticmethod
     def on_branch(repo: LifeRepo, branch_name: str) -> bool:
         """Check if currently on a specific branch"""
-        return repo.current_branch() == branch_name
+        return _run(repo, _on_branch(branch_name))
 
     @staticmethod
     def has_commits(repo: LifeRepo, minimum: int = 1) -> bool:
         """Check if repo has at least minimum number of commits"""
-        return repo.count_commits() >= minimum
+        return _run(repo, _has_commits(minimum))
 
     @staticmethod
     def branches_merged(repo: LifeRepo, source: str, target: str) -> bool:
         """Check if source branch is merged into target"""
-        if source not in repo.list_branches():
-            return False
-        if target not in repo.list_branches():
-            return False
-
-        # Check if source's tip commit is in target's history
-        source_commit = repo.repo.heads[source].commit
-        target_commits = list(repo.repo.iter_commits(target))
-        return source_commit in target_commits
+        return _run(repo, _branches_merged(source, target))
 
     @staticmethod
     def conflict_resolved(repo: LifeRepo) -> bool:
         """Check if merge conflicts are resolved"""
-        return not repo.has_conflicts() and not repo.has_uncommitted_changes()
+        return _run(repo, _conflict_resolved())
+
+    @staticmethod
+    def conflict_markers_removed(repo: LifeRepo) -> bool:
+        """Check that no conflicted file still contains conflict markers"""
+        return _run(repo, _conflict_markers_removed())
+
+
+class AsyncStageValidator:
+    """StageValidator's checks for use with AsyncLifeRepo"""
+
+    @staticmethod
+    async def file_present(repo: "AsyncLifeRepo", filename: str) -> bool:
+        """Check if file exists in the repo's working tree (or tip tree if bare)"""
+        return await _run_async(repo, _file_present(filename))
+
+    @staticmethod
+    async def file_exists_and_committed(repo: "AsyncLifeRepo", filename: str) -> bool:
+        """Check if file exists and was included in the last commit"""
+        return await _run_async(repo, _file_exists_and_committed(filename))
+
+    @staticmethod
+    async def branch_exists(repo: "AsyncLifeRepo", branch_name: str) -> bool:
+        """Check if a branch exists"""
+        return await _run_async(repo, _branch_exists(branch_name))
+
+    @staticmethod
+    async def on_branch(repo: "AsyncLifeRepo", branch_name: str) -> bool:
+        """Check if currently on a specific branch"""
+        return await _run_async(repo, _on_branch(branch_name))
+
+    @staticmethod
+    async def has_commits(repo: "AsyncLifeRepo", minimum: int = 1) -> bool:
+        """Check if repo has at least minimum number of commits"""
+        return await _run_async(repo, _has_commits(minimum))
+
+    @staticmethod
+    async def branches_merged(repo: "AsyncLifeRepo", source: str, target: str) -> bool:
+        """Check if source branch is merged into target"""
+        return await _run_async(repo, _branches_merged(source, target))
+
+    @staticmethod
+    async def conflict_resolved(repo: "AsyncLifeRepo") -> bool:
+        """Check if merge conflicts are resolved"""
+        return await _run_async(repo, _conflict_resolved())
+
+    @staticmethod
+    async def conflict_markers_removed(repo: "AsyncLifeRepo") -> bool:
+        """Check that no conflicted file still contains conflict markers"""
+        return await _run_async(repo, _conflict_markers_removed())
@@ -0,0 +1,306 @@
+"""Work queue for distributed grading
+
+Jobs are leased rather than popped: a worker claims a job for a limited
+time, and a job whose lease expires (worker crashed, machine lost) goes
+back to the queue until it runs out of attempts. Results are keyed by
+repository and act, so reporting the same result twice is harmless.
+
+SqliteQueue works for several processes on one machine, in WAL mode.
+WAL needs memory shared by every process using the database, so on a
+network mount (NFS, SMB, ...) the queue falls back to SQLite's rollback
+journal, which in turn relies on the mount's file locking; only
+filesystems with reliable POSIX locks are safe to share between
+machines. Other backends implement JobQueue and register under the
+``lifegit.queues`` entry-point group by URL scheme.
+"""
+
+import json
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from importlib.metadata import entry_points
+from pathlib import Path
+
+QUEUE_ENTRY_POINT_GROUP = "lifegit.queues"
+
+DEFAULT_LEASE_SECONDS = 300.0
+DEFAULT_MAX_ATTEMPTS = 3
+
+# Mount types (from /proc/mounts) that can't host a WAL database
+NETWORK_FILESYSTEMS = frozenset(
+    {"nfs", "nfs4", "cifs", "smb3", "smbfs", "9p", "afs", "ceph", "glusterfs", "fuse.sshfs"}
+)
+
+
+def _mount_type(path: Path) -> str | None:
+    """Filesystem type of the mount holding path, if /proc/mounts says"""
+    try:
+        mounts = Path("/proc/mounts").read_text().splitlines()
+    except OSError:
+        return None
+    path = path.resolve()
+    found, depth = None, -1
+    for line in mounts:
+        fields = line.split()
+        if len(fields) < 3:
+            continue
+        point = Path(fields[1].replace("\\040", " "))
+        if (point == path or point in path.parents) and len(point.parts) > depth:
+            found, depth = fields[2], len(point.parts)
+    return found
+
+
+def journal_mode_for(path: Path) -> str:
+    """WAL on a local disk, the rollback journal on a network mount"""
+    return "DELETE" if _mount_type(Path(path).parent) in NETWORK_FILESYSTEMS else "WAL"
+
+
+@dataclass(frozen=True, slots=True)
+class Job:
+    """One repository to grade for a set of acts"""
+
+    id: str  # the repository location, unique within a queue
+    acts: tuple[int, ...]
+    attempts: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class JobResult:
+    """Outcome of validating one act of one repository"""
+
+    repo: str
+    act: int
+    passed: bool
+    duration_ms: float
+    head_sha: str | None = None
+    failing_check: str | None = None
+    error: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class QueueProgress:
+    pending: int = 0
+    running: int = 0
+    done: int = 0
+    failed: int = 0
+
+    @property
+    def total(self) -> int:
+        return self.pending + self.running + self.done + self.failed
+
+    @property
+    def finished(self) -> bool:
+        return self.pending == 0 and self.running == 0
+
+
+class JobQueue(ABC):
+    """Interface every grading queue backend provides"""
+
+    @abstractmethod
+    def enqueue(self, jobs: list[Job]) -> int:
+        """Add jobs, skipping ones already queued; return how many were new"""
+
+    @abstractmethod
+    def claim(self, worker: str) -> Job | None:
+        """Lease the next available job to worker, or None if there is none"""
+
+    @abstractmethod
+    def complete(self, job: Job, worker: str, results: list[JobResult]):
+        """Store results for a job and mark it done, unless worker no longer holds it"""
+
+    @abstractmethod
+    def fail(self, job: Job, worker: str, error: str):
+        """Give a job back after an error; it is retried until out of attempts"""
+
+    @abstractmethod
+    def progress(self) -> QueueProgress:
+        """Count jobs in each state"""
+
+    @abstractmethod
+    def results(self) -> list[JobResult]:
+        """All results reported so far"""
+
+
+class _ImmediateTransaction:
+    """BEGIN IMMEDIATE ... COMMIT, so two workers can't claim the same job"""
+
+    def __init__(self, db: sqlite3.Connection):
+        self._db = db
+
+    def __enter__(self):
+        self._db.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type, *_):
+        self._db.execute("ROLLBACK" if exc_type else "COMMIT")
+
+
+class SqliteQueue(JobQueue):
+    """Job queue stored in a single SQLite database file
+
+    journal_mode defaults to journal_mode_for(path); pass "DELETE" where
+    the mount type can't be detected but the file is shared over a network.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        journal_mode: str | None = None,
+    ):
+        self.path = Path(path)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.journal_mode = (journal_mode or journal_mode_for(self.path)).upper()
+        if self.journal_mode not in ("WAL", "DELETE", "TRUNCATE", "PERSIST"):
+            raise ValueError(f"Unsupported SQLite journal mode: {journal_mode}")
+
+        self._db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        self._db.execute(f"PRAGMA journal_mode={self.journal_mode}")
+        self._db.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                acts TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                lease_expires REAL,
+                error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, lease_expires);
+            CREATE TABLE IF NOT EXISTS results (
+                repo TEXT NOT NULL,
+                act INTEGER NOT NULL,
+                passed INTEGER NOT NULL,
+                duration_ms REAL NOT NULL,
+                head_sha TEXT,
+                failing_check TEXT,
+                error TEXT,
+                PRIMARY KEY (repo, act)
+            );
+            """
+        )
+
+    def _transaction(self) -> _ImmediateTransaction:
+        return _ImmediateTransaction(self._db)
+
+    def enqueue(self, jobs: list[Job]) -> int:
+        with self._transaction():
+            before = self._db.total_changes
+            self._db.executemany(
+                "INSERT OR IGNORE INTO jobs (id, acts) VALUES (?, ?)",
+                [(job.id, json.dumps(job.acts)) for job in jobs],
+            )
+            return self._db.total_changes - before
+
+    def claim(self, worker: str) -> Job | None:
+        now = time.time()
+        with self._transaction():
+            while True:
+                row = self._db.execute(
+                    """
+                    SELECT id, acts, attempts FROM jobs
+                    WHERE status = 'pending'
+                       OR (status = 'running' AND lease_expires < ?)
+                    ORDER BY rowid LIMIT 1
+                    """,
+                    (now,),
+                ).fetchone()
+                if row is None:
+                    return None
+
+                job_id, acts, attempts = row
+                if attempts < self.max_attempts:
+                    break
+                # Lease ran out on the last attempt: the worker never came back
+                self._db.execute(
+                    "UPDATE jobs SET status = 'failed', error = ? WHERE id = ?",
+                    ("lease expired", job_id),
+                )
+
+            self._db.execute(
+                """
+                UPDATE jobs SET status = 'running', attempts = attempts + 1,
+                                worker = ?, lease_expires = ?
+                WHERE id = ?
+                """,
+                (worker, now + self.lease_seconds, job_id),
+            )
+        return Job(id=job_id, acts=tuple(json.loads(acts)), attempts=attempts + 1)
+
+    def complete(self, job: Job, worker: str, results: list[JobResult]):
+        with self._transaction():
+            # A worker whose lease ran out and was taken over reports nothing
+            updated = self._db.execute(
+                """
+                UPDATE jobs SET status = 'done', lease_expires = NULL, error = NULL
+                WHERE id = ? AND worker = ? AND status = 'running'
+                """,
+                (job.id, worker),
+            )
+            if updated.rowcount == 0:
+                return
+            self._db.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        r.repo,
+                        r.act,
+                        r.passed,
+                        r.duration_ms,
+                        r.head_sha,
+                        r.failing_check,
+                        r.error,
+                    )
+                    for r in results
+                ],
+            )
+
+    def fail(self, job: Job, worker: str, error: str):
+        status = "failed" if job.attempts >= self.max_attempts else "pending"
+        with self._transaction():
+            # Only the current lease holder may give the job back
+            self._db.execute(
+                """
+                UPDATE jobs SET status = ?, error = ?, lease_expires = NULL
+                WHERE id = ? AND worker = ? AND status = 'running'
+                """,
+                (status, error, job.id, worker),
+            )
+
+    def progress(self) -> QueueProgress:
+        counts = dict(
+            self._db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status")
+        )
+        return QueueProgress(
+            pending=counts.get("pending", 0),
+            running=counts.get("running", 0),
+            done=counts.get("done", 0),
+            failed=counts.get("failed", 0),
+        )
+
+    def results(self) -> list[JobResult]:
+        rows = self._db.execute(
+            "SELECT repo, act, passed, duration_ms, head_sha, failing_check, error "
+            "FROM results ORDER BY repo, act"
+        )
+        return [
+            JobResult(repo, act, bool(passed), duration_ms, head_sha, check, error)
+            for repo, act, passed, duration_ms, head_sha, check, error in rows
+        ]
+
+    def close(self):
+        self._db.close()
+
+
+def open_queue(location: str) -> JobQueue:
+    """Open a queue from a URL (``scheme://...``) or a plain SQLite file path"""
+    scheme, separator, rest = location.partition("://")
+    if not separator or scheme == "sqlite":
+        return SqliteQueue(Path(rest if separator else location))
+
+    for ep in entry_points(group=QUEUE_ENTRY_POINT_GROUP, name=scheme):
+        return ep.load()(location)
+    raise ValueError(f"No queue backend registered for '{scheme}://'")
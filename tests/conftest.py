@@ -0,0 +1,31 @@
+import subprocess
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def git_identity(monkeypatch):
+    """Commit without relying on the machine's git config"""
+    for var in ("AUTHOR", "COMMITTER"):
+        monkeypatch.setenv(f"GIT_{var}_NAME", "Student")
+        monkeypatch.setenv(f"GIT_{var}_EMAIL", "student@example.com")
+    monkeypatch.setenv("GIT_CONFIG_NOSYSTEM", "1")
+
+
+def git(path: Path, *args: str, check: bool = True) -> str:
+    return subprocess.run(
+        ["git", "-C", str(path), *args], check=check, capture_output=True, text=True
+    ).stdout
+
+
+@pytest.fixture
+def act1_repo(tmp_path) -> Path:
+    """A repository that has finished Act 1: one commit on main"""
+    path = tmp_path / "life"
+    path.mkdir()
+    git(path, "init", "-q", "-b", "main")
+    (path / "decision.txt").write_text("I chose to study.\n")
+    git(path, "add", "decision.txt")
+    git(path, "commit", "-q", "-m", "My first decision")
+    return path
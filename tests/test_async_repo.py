@@ -0,0 +1,20 @@
+import asyncio
+
+from lifegit.async_repo import AsyncLifeRepo
+from lifegit.git_wrapper import LifeRepo
+
+
+def test_nested_folder_is_not_its_parents_repo(act1_repo):
+    nested = act1_repo / "notes"
+    nested.mkdir()
+
+    assert not asyncio.run(AsyncLifeRepo(nested).is_git_repo())
+    assert not LifeRepo(nested).is_git_repo()
+
+
+def test_repo_root_is_found(act1_repo):
+    async def check():
+        repo = AsyncLifeRepo(act1_repo)
+        return await repo.is_git_repo(), await repo.count_commits()
+
+    assert asyncio.run(check()) == (True, 1)
@@ -0,0 +1,18 @@
+import pytest
+
+from lifegit.budget import Budget, BudgetExceeded
+from lifegit.git_wrapper import LifeRepo
+
+
+def test_object_budget_stops_a_long_walk(act1_repo):
+    with LifeRepo(act1_repo) as repo:
+        with pytest.raises(BudgetExceeded), repo.budget(Budget(objects=0)):
+            repo.count_commits()
+
+
+def test_cached_fact_is_still_held_to_the_time_budget(act1_repo):
+    with LifeRepo(act1_repo) as repo:
+        assert repo.count_commits() == 1
+        with pytest.raises(BudgetExceeded), repo.budget(Budget(seconds=0)):
+            repo.count_commits()
+        assert repo.fact_cache_stats().hits == 1
@@ -0,0 +1,62 @@
+from lifegit import checkpoints
+from lifegit.git_wrapper import LifeRepo
+
+from .conftest import git
+
+
+def tree_names(repo: LifeRepo, sha: str) -> list[str]:
+    env = checkpoints._objects(checkpoints._store(repo))
+    return repo.repo.git.ls_tree("--name-only", sha, env=env).split()
+
+
+def test_restore_round_trip(act1_repo):
+    decision = act1_repo / "decision.txt"
+    with LifeRepo(act1_repo) as repo:
+        first = repo.checkpoint("step 1")
+        decision.write_text("I changed my mind.\n")
+        (act1_repo / "draft.txt").write_text("untracked\n")
+
+        repo.restore_checkpoint(first)
+
+        assert decision.read_text() == "I chose to study.\n"
+        assert not (act1_repo / "draft.txt").exists()
+        labels = [c.label for c in repo.list_checkpoints()]
+        assert labels == [f"before restoring {first.sha[:7]}", "step 1"]
+
+        repo.restore_checkpoint(repo.find_checkpoint("0"))
+        assert decision.read_text() == "I changed my mind.\n"
+        assert (act1_repo / "draft.txt").exists()
+
+
+def test_large_untracked_files_are_left_out(act1_repo, monkeypatch):
+    monkeypatch.setattr(checkpoints, "MAX_UNTRACKED_BYTES", 10)
+    (act1_repo / "small.txt").write_text("tiny\n")
+    (act1_repo / "video.bin").write_bytes(b"x" * 100)
+
+    with LifeRepo(act1_repo) as repo:
+        first = repo.checkpoint("step 1")
+        assert tree_names(repo, first.sha) == ["decision.txt", "small.txt"]
+
+        # Grown past the cap after an earlier checkpoint recorded it
+        (act1_repo / "small.txt").write_text("no longer tiny at all\n")
+        second = repo.checkpoint("step 2")
+        assert tree_names(repo, second.sha) == ["decision.txt"]
+
+
+def test_checkpoints_stay_out_of_the_students_history(act1_repo):
+    (act1_repo / "draft.txt").write_text("untracked\n")
+    with LifeRepo(act1_repo) as repo:
+        first = repo.checkpoint("step 1")
+
+        assert git(act1_repo, "for-each-ref", "--format=%(refname)") == "refs/heads/main\n"
+        assert len(git(act1_repo, "log", "--all", "--oneline").splitlines()) == 1
+        assert git(act1_repo, "cat-file", "-t", first.sha, check=False) == ""
+
+        # A restore writes the checkpoint's files back, and the student's
+        # next commit leaves a complete repository
+        (act1_repo / "draft.txt").unlink()
+        repo.restore_checkpoint(first)
+    assert (act1_repo / "draft.txt").exists()
+    git(act1_repo, "add", "draft.txt")
+    git(act1_repo, "commit", "-q", "-m", "Keep the draft")
+    git(act1_repo, "fsck", "--strict")
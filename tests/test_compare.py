@@ -0,0 +1,18 @@
+import pytest
+
+from lifegit.compare import NoCommonAncestorError
+from lifegit.git_wrapper import LifeRepo
+
+from .conftest import git
+
+
+def test_fork_point_of_unrelated_histories(act1_repo):
+    git(act1_repo, "checkout", "-q", "--orphan", "elsewhere")
+    git(act1_repo, "rm", "-q", "--cached", "decision.txt")
+    git(act1_repo, "commit", "-q", "--allow-empty", "-m", "A life from scratch")
+    git(act1_repo, "checkout", "-q", "-f", "main")
+
+    with LifeRepo(act1_repo) as repo:
+        assert [c.path for c in repo.compare("main", "elsewhere")] == ["decision.txt"]
+        with pytest.raises(NoCommonAncestorError):
+            repo.compare("main", "elsewhere", fork_point=True)
@@ -0,0 +1,17 @@
+import shutil
+from pathlib import Path
+
+from lifegit import content
+from lifegit.content import ContentStore
+
+
+def test_undecodable_edit_keeps_last_good_content(tmp_path):
+    path = tmp_path / "content.toml"
+    shutil.copyfile(Path(content.__file__).with_name("content.toml"), path)
+    store = ContentStore(path, check_interval=0)
+    good = store.current()
+
+    path.write_bytes(path.read_bytes() + b'\n# caf\xe9 in Latin-1\n')
+
+    assert store.current() is good
+    assert isinstance(store.last_error, UnicodeDecodeError)
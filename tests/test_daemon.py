@@ -0,0 +1,37 @@
+import json
+import threading
+
+import pytest
+
+from lifegit import daemon
+
+pytestmark = pytest.mark.skipif(not daemon.supported(), reason="needs Unix sockets")
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.delenv("LIFEGIT_NO_DAEMON", raising=False)
+    path = tmp_path / "run" / "daemon.sock"
+    server = daemon.LifegitDaemon(path, idle_timeout=60)
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    thread.join()
+
+
+def test_validate_json_error_stays_json(server, tmp_path):
+    args = {"path": str(tmp_path / "missing"), "act": 1, "as_json": True}
+    exit_code, output = daemon.forward("validate", args, socket=server.path)
+
+    assert exit_code == 1
+    assert "error" in json.loads(output)
+
+
+def test_socket_in_a_shared_directory_is_not_trusted(server):
+    server.path.parent.chmod(0o777)
+    try:
+        assert daemon.forward("ping", {}, socket=server.path) is None
+    finally:
+        server.path.parent.chmod(0o700)
+    assert daemon.forward("ping", {}, socket=server.path) == (0, "")
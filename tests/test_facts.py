@@ -0,0 +1,92 @@
+import pytest
+
+from lifegit import facts
+from lifegit.facts import FACT_CACHE_SIZE, FactCache
+from lifegit.git_wrapper import LifeRepo
+
+from .conftest import git
+
+
+@pytest.fixture
+def repo(act1_repo):
+    with LifeRepo(act1_repo) as repo:
+        yield repo
+
+
+def test_repeated_questions_are_answered_from_the_cache(repo):
+    assert repo.count_commits() == 1
+    assert repo.count_commits() == 1
+    assert repo.list_branches() == ["main"]
+    assert repo.list_branches() == ["main"]
+
+    stats = repo.fact_cache_stats()
+    assert (stats.hits, stats.misses, stats.invalidations) == (2, 2, 0)
+
+
+def test_commit_from_the_git_cli_invalidates(repo, act1_repo):
+    assert repo.count_commits() == 1
+    assert repo.get_last_commit_message() == "My first decision"
+
+    (act1_repo / "decision.txt").write_text("I chose to travel.\n")
+    git(act1_repo, "commit", "-q", "-am", "Changed my mind")
+
+    assert repo.count_commits() == 2
+    assert repo.get_last_commit_message() == "Changed my mind"
+    assert repo.fact_cache_stats().invalidations == 2
+
+
+def test_branch_created_from_the_git_cli_invalidates(repo, act1_repo):
+    assert not repo.has_branch("what-if-travel")
+    assert repo.list_branches() == ["main"]
+
+    git(act1_repo, "branch", "what-if-travel")
+
+    assert repo.has_branch("what-if-travel")
+    assert repo.list_branches() == ["main", "what-if-travel"]
+
+
+def test_ref_update_from_the_git_cli_invalidates(repo, act1_repo):
+    git(act1_repo, "checkout", "-q", "-b", "what-if-travel")
+    (act1_repo / "travel-life.txt").write_text("I backpacked for a year.\n")
+    git(act1_repo, "add", "travel-life.txt")
+    git(act1_repo, "commit", "-q", "-m", "What if I traveled")
+    git(act1_repo, "checkout", "-q", "main")
+    git(act1_repo, "pack-refs", "--all")
+    assert repo.count_commits("main") == 1
+
+    # Moves a packed ref, so only packed-refs changes
+    git(act1_repo, "update-ref", "refs/heads/main", "what-if-travel")
+
+    assert repo.count_commits("main") == 2
+
+
+def test_cache_can_be_turned_off(act1_repo, monkeypatch):
+    monkeypatch.setenv("LIFEGIT_NO_FACT_CACHE", "1")
+    with LifeRepo(act1_repo) as repo:
+        repo.count_commits()
+        repo.count_commits()
+        assert repo.fact_cache_stats().size == 0
+
+
+def test_least_recently_used_fact_is_evicted():
+    cache = FactCache()
+    for key in range(FACT_CACHE_SIZE):
+        cache.store(key, "stamp", key)
+    assert cache.lookup(0, "stamp") == 0  # now the most recently used
+
+    cache.store("one more", "stamp", "value")
+
+    assert cache.stats().size == FACT_CACHE_SIZE
+    assert cache.lookup(1, "stamp") is facts.MISSING
+    assert cache.lookup(0, "stamp") == 0
+    assert cache.lookup("one more", "stamp") == "value"
+
+
+def test_changed_stamp_counts_as_invalidation():
+    cache = FactCache()
+    cache.store("head", "old", 1)
+
+    assert cache.lookup("head", "new") is facts.MISSING
+    assert cache.stats().invalidations == 1
+    assert cache.lookup("head", "new") is facts.MISSING
+    assert cache.stats().invalidations == 1
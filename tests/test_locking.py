@@ -0,0 +1,39 @@
+import threading
+import time
+
+import pytest
+from git.exc import GitCommandError
+
+from lifegit.git_wrapper import LifeRepo
+from lifegit.gitparse import is_lock_error
+
+
+def test_only_git_lock_messages_are_lock_errors(act1_repo):
+    (act1_repo / ".git" / "index.lock").touch()
+    with LifeRepo(act1_repo) as repo:
+        with pytest.raises(GitCommandError) as held:
+            repo.repo.git.commit("--allow-empty", "-m", "blocked")
+    assert is_lock_error(held.value)
+
+    missing = GitCommandError(
+        ["git", "add", "notes.lock"], 128, "fatal: pathspec 'notes.lock' did not match"
+    )
+    assert not is_lock_error(missing)
+    assert not is_lock_error(OSError("could not read config.lock"))
+
+
+def test_backing_off_leaves_the_repo_usable(act1_repo):
+    lock = act1_repo / ".git" / "index.lock"
+    lock.touch()
+    with LifeRepo(act1_repo) as repo:
+        writer = threading.Thread(target=repo.create_branch, args=("what-if",))
+        writer.start()
+        time.sleep(0.1)  # the writer is now waiting for index.lock
+
+        started = time.monotonic()
+        assert repo.current_branch() == "main"
+        assert time.monotonic() - started < 0.5
+
+        lock.unlink()
+        writer.join()
+        assert repo.has_branch("what-if")
@@ -0,0 +1,28 @@
+from lifegit import maintenance
+from lifegit.git_wrapper import LifeRepo
+
+
+def test_checks_are_throttled(act1_repo, monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        maintenance, "maintain_quietly", lambda repo: calls.append(repo) or ()
+    )
+
+    with LifeRepo(act1_repo) as repo:
+        repo.maintain_if_due()
+        repo.maintain_if_due()
+        assert len(calls) == 1
+
+        monkeypatch.setattr(maintenance, "CHECK_INTERVAL_SECONDS", 0.0)
+        repo.maintain_if_due()
+        assert len(calls) == 2
+
+
+def test_due_tasks_follow_the_object_store(act1_repo):
+    with LifeRepo(act1_repo) as repo:
+        thresholds = maintenance.Thresholds(graph_min_objects=1, loose_objects=1)
+        assert maintenance.maintain(repo, thresholds=thresholds) == (
+            "loose-objects",
+            "commit-graph",
+        )
+        assert maintenance.plan(maintenance.object_stats(repo), thresholds) == ()
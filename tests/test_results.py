@@ -0,0 +1,25 @@
+import pytest
+
+from lifegit.results import ResultStore
+from lifegit.work_queue import JobResult
+
+
+def result(repo: str, passed: bool, act: int = 1) -> JobResult:
+    return JobResult(repo, act, passed, 1.0, failing_check=None if passed else "committed")
+
+
+def test_latest_follows_the_newest_run(tmp_path):
+    with ResultStore(tmp_path / "results.db") as store:
+        first, _ = store.record([result("a", True), result("b", False)], label="monday")
+        second, recorded = store.record([result("a", False)], label="tuesday")
+
+        assert (recorded, second > first) == (1, True)
+        assert store.not_passed(1) == ["a", "b"]
+        assert [r.repo for r in store.regressions()] == ["a"]
+
+
+def test_a_failed_record_leaves_no_run(tmp_path):
+    with ResultStore(tmp_path / "results.db") as store:
+        with pytest.raises(AttributeError):
+            store.record([result("a", True), None])
+        assert store.last_runs() == []
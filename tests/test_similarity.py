@@ -0,0 +1,44 @@
+import pytest
+
+from lifegit.similarity import Document, SimilarityIndex, signature
+
+ESSAY = (
+    "I chose to leave home and study marine biology on the coast, "
+    "trading the quiet of the village for long nights in the lab.\n"
+)
+TEMPLATE = "Write about the decision you made here. Why did you choose it?\n"
+
+
+def index_texts(index: SimilarityIndex, texts: dict[str, str]):
+    for repo, text in texts.items():
+        sig = signature(text)
+        documents = [] if sig is None else [Document(repo, "main:decision.txt", repo, sig)]
+        index.update_repo(repo, documents)
+
+
+def test_short_files_are_not_signed():
+    assert signature("") is None
+    assert signature("yes\n") is None
+    assert signature(ESSAY) is not None
+
+
+def test_copies_are_paired_across_repositories(tmp_path):
+    with SimilarityIndex(tmp_path / "index.db") as index:
+        index_texts(index, {"a": ESSAY, "b": ESSAY, "c": TEMPLATE})
+        matches = index.duplicates()
+
+    assert [(m.repo, m.other_repo, m.similarity) for m in matches] == [("a", "b", 1.0)]
+
+
+def test_template_copies_are_ignored(tmp_path):
+    with SimilarityIndex(tmp_path / "index.db") as index:
+        index_texts(index, {"a": TEMPLATE, "b": TEMPLATE})
+        assert index.add_template(TEMPLATE) == 2
+        assert len(index) == 0
+
+        index_texts(index, {"c": TEMPLATE, "d": TEMPLATE, "e": ESSAY})
+        assert index.duplicates() == []
+        assert len(index) == 1
+
+        with pytest.raises(ValueError):
+            index.add_template("todo")
@@ -0,0 +1,33 @@
+from rich.console import Console
+
+from lifegit.cli import run_validate
+from lifegit.git_wrapper import LifeRepo
+from lifegit.grading import grade_repo
+
+from .conftest import git
+
+
+def validate_act2(path):
+    with LifeRepo(path) as repo:
+        return run_validate(repo, 2, as_json=False, console=Console(quiet=True))
+
+
+def test_empty_whatif_branch_is_not_complete(act1_repo):
+    git(act1_repo, "branch", "what-if-travel")
+
+    assert validate_act2(act1_repo) == (False, "new-commit")
+    [result] = grade_repo(act1_repo, (2,))
+    assert not result.passed
+    assert result.failing_check == "new-commit"
+
+
+def test_commit_on_whatif_branch_completes_act2(act1_repo):
+    git(act1_repo, "checkout", "-q", "-b", "what-if-travel")
+    (act1_repo / "travel-life.txt").write_text("I backpacked for a year.\n")
+    git(act1_repo, "add", "travel-life.txt")
+    git(act1_repo, "commit", "-q", "-m", "What if I traveled")
+    git(act1_repo, "checkout", "-q", "main")
+
+    assert validate_act2(act1_repo) == (True, None)
+    [result] = grade_repo(act1_repo, (2,))
+    assert result.passed
@@ -0,0 +1,39 @@
+import asyncio
+
+from lifegit.async_repo import AsyncLifeRepo
+from lifegit.git_wrapper import LifeRepo
+from lifegit.validator import AsyncStageValidator, StageValidator
+
+from .conftest import git
+
+CHECKS = [
+    ("file_present", ("decision.txt",)),
+    ("file_present", ("missing.txt",)),
+    ("file_exists_and_committed", ("decision.txt",)),
+    ("branch_exists", ("main",)),
+    ("branch_exists", ("what-if-travel",)),
+    ("on_branch", ("main",)),
+    ("has_commits", (1,)),
+    ("has_commits", (2,)),
+    ("branches_merged", ("what-if-travel", "main")),
+    ("branches_merged", ("what-if-music", "main")),
+    ("conflict_resolved", ()),
+    ("conflict_markers_removed", ()),
+]
+
+
+def test_sync_and_async_validators_agree(act1_repo):
+    git(act1_repo, "branch", "what-if-travel")
+    (act1_repo / "scratch.txt").write_text("not yet added\n")
+
+    with LifeRepo(act1_repo) as repo:
+        expected = [getattr(StageValidator, name)(repo, *args) for name, args in CHECKS]
+
+    async def run_async():
+        repo = AsyncLifeRepo(act1_repo)
+        return [await getattr(AsyncStageValidator, name)(repo, *args) for name, args in CHECKS]
+
+    assert expected == [
+        True, False, True, True, True, True, True, False, True, False, False, True
+    ]
+    assert asyncio.run(run_async()) == expected
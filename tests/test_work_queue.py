@@ -0,0 +1,36 @@
+from lifegit import work_queue
+from lifegit.work_queue import Job, JobResult, SqliteQueue
+
+
+def result(passed: bool) -> JobResult:
+    return JobResult("life", 1, passed, 1.0, None, None if passed else "x", None)
+
+
+def test_stale_complete_is_ignored(tmp_path):
+    # Every lease is already expired, so a second worker can take the job over
+    queue = SqliteQueue(tmp_path / "queue.db", lease_seconds=-1)
+    queue.enqueue([Job("life", (1,))])
+    first = queue.claim("first")
+    second = queue.claim("second")
+
+    queue.complete(first, "first", [result(False)])
+    assert queue.progress().running == 1
+    assert queue.results() == []
+
+    queue.complete(second, "second", [result(True)])
+    assert queue.progress().done == 1
+    assert queue.results() == [result(True)]
+
+
+def test_network_mount_uses_the_rollback_journal(tmp_path, monkeypatch):
+    monkeypatch.setattr(work_queue, "_mount_type", lambda path: "nfs4")
+    queue = SqliteQueue(tmp_path / "queue.db")
+
+    assert queue._db.execute("PRAGMA journal_mode").fetchone() == ("delete",)
+
+
+def test_local_disk_uses_wal(tmp_path, monkeypatch):
+    monkeypatch.setattr(work_queue, "_mount_type", lambda path: "ext4")
+    queue = SqliteQueue(tmp_path / "queue.db")
+
+    assert queue._db.execute("PRAGMA journal_mode").fetchone() == ("wal",)